@@ -1,6 +1,7 @@
 """Code analysis agent implementation"""
 
-from pathlib import Path
+import os
+import stat
 from typing import List, Optional, Dict, Any
 
 from devagent.core.interfaces import Agent, Task, TaskResult
@@ -18,9 +19,14 @@ class AnalysisAgent(Agent):
         try:
             target = task.parameters['target']
 
-            if Path(target).is_file():
+            try:
+                st = os.stat(target)
+            except OSError:
+                raise ValueError(f"Target '{target}' is not a valid file or directory.")
+
+            if stat.S_ISREG(st.st_mode):
                 return self._analyze_file(target, task.parameters)
-            elif Path(target).is_dir():
+            elif stat.S_ISDIR(st.st_mode):
                 return self._analyze_directory(target, task.parameters)
             else:
                 raise ValueError(f"Target '{target}' is not a valid file or directory.")
@@ -1,9 +1,12 @@
 """Documentation generation agent implementation"""
 
+import os
+import asyncio
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
-from devagent.core.interfaces import Agent, Task, TaskResult
+from devagent.core.interfaces import Agent, Task, TaskResult, LLMProvider
+from devagent.core.paths import find_project_root
 from devagent.analysis.analyzer_factory import AnalyzerFactory
 from devagent.context.context_engine import DevAgentContextEngine
 from devagent.llm.providers import LLMProviderFactory
@@ -13,20 +16,12 @@ from devagent.llm.prompts import DocumentationPrompts
 class DocumentationAgent(Agent):
     """Agent for generating comprehensive documentation"""
     
-    def __init__(self, config):
+    def __init__(self, config, llm_provider: Optional[LLMProvider] = None):
         self.config = config
-        try:
-            self.llm_provider = LLMProviderFactory.create_provider(
-                config.llm.provider,
-                model=config.llm.model,
-                api_key_env=config.llm.api_key_env,
-                max_tokens=config.llm.max_tokens,
-                temperature=config.llm.temperature
-            )
-        except Exception:
-            # Fallback to mock provider if real provider fails
-            self.llm_provider = LLMProviderFactory.create_provider('mock')
-        self.context_engine = None
+        if llm_provider is not None:
+            self.llm_provider = llm_provider
+        else:
+            self.llm_provider = LLMProviderFactory.create_provider_with_fallback(config.llm)
     
     def execute_task(self, task: Task) -> TaskResult:
         """Execute documentation generation task"""
@@ -37,7 +32,13 @@ class DocumentationAgent(Agent):
             include_examples = task.parameters.get('include_examples', True)
             
             # Try to determine if target is a file or symbol
-            if Path(target).exists():
+            try:
+                os.stat(target)
+                is_path = True
+            except OSError:
+                is_path = False
+            
+            if is_path:
                 return self._generate_file_docs(target, format_type, output_path, include_examples)
             else:
                 return self._generate_symbol_docs(target, format_type, output_path, include_examples, task.target_file)
@@ -52,9 +53,13 @@ class DocumentationAgent(Agent):
     
     def _generate_file_docs(self, file_path: str, format_type: str, output_path: str, include_examples: bool) -> TaskResult:
         """Generate documentation for entire file"""
-        # Initialize context engine
-        project_path = self._find_project_root(file_path)
-        self.context_engine = DevAgentContextEngine(project_path)
+        # Initialize context engine; kept local since one agent serves concurrent tasks
+        project_path = find_project_root(str(Path(file_path).parent))
+        context_engine = DevAgentContextEngine(
+            project_path,
+            embedding_backend=self.config.indexing.embedding_backend,
+            vector_backend=self.config.indexing.vector_backend
+        )
         
         # Analyze file
         analyzer = AnalyzerFactory.create_analyzer(file_path)
@@ -65,39 +70,42 @@ class DocumentationAgent(Agent):
         classes = analyzer.extract_classes(file_path) if hasattr(analyzer, 'extract_classes') else []
         
         # Get context
-        context = self.context_engine.get_file_context(file_path)
+        context = context_engine.get_file_context(file_path)
         
         # Generate documentation for each function
-        docs_content = f"# Documentation for {Path(file_path).name}\n\n"
+        parts = [f"# Documentation for {Path(file_path).name}\n\n"]
         
         if functions:
-            docs_content += "## Functions\n\n"
-            for func in functions:
-                func_analysis = analyzer.analyze_function(file_path, func['name'])
-                with open(file_path, 'r') as f:
-                    lines = f.readlines()
-                    func_code = ''.join(lines[func_analysis.start_line-1:func_analysis.end_line])
-                
-                language = AnalyzerFactory.detect_language(file_path)
-                prompt = DocumentationPrompts.create_function_doc_prompt(
-                    func_analysis, func_code, language, format_type, context, include_examples
-                )
-                
-                func_docs = self.llm_provider.generate_code(prompt)
-                docs_content += f"{func_docs}\n\n"
+            parts.append("## Functions\n\n")
+            with open(file_path, 'r') as f:
+                source_lines = f.readlines()
+            language = AnalyzerFactory.detect_language(file_path)
+            
+            analyses = AnalyzerFactory.analyze_functions(file_path, [func['name'] for func in functions])
+            
+            build_prompt = DocumentationPrompts.build_function_doc_prompt_factory(
+                language, format_type, context, include_examples
+            )
+            prompts = [
+                build_prompt(func_analysis, ''.join(source_lines[func_analysis.start_line-1:func_analysis.end_line]))
+                for func_analysis in analyses
+            ]
+            
+            for func_docs in asyncio.run(self._generate_function_docs_async(prompts)):
+                parts.append(f"{func_docs}\n\n")
         
         if classes:
-            docs_content += "## Classes\n\n"
+            parts.append("## Classes\n\n")
             for cls in classes:
-                docs_content += f"### {cls['name']}\n\n"
+                parts.append(f"### {cls['name']}\n\n")
                 if cls.get('docstring'):
-                    docs_content += f"{cls['docstring']}\n\n"
+                    parts.append(f"{cls['docstring']}\n\n")
                 
                 if cls.get('methods'):
-                    docs_content += "#### Methods\n\n"
+                    parts.append("#### Methods\n\n")
                     for method in cls['methods']:
-                        docs_content += f"- **{method['name']}**: {method.get('docstring', 'No description')}\n"
-                    docs_content += "\n"
+                        parts.append(f"- **{method['name']}**: {method.get('docstring', 'No description')}\n")
+                    parts.append("\n")
         
         # Write documentation
         if output_path:
@@ -106,7 +114,7 @@ class DocumentationAgent(Agent):
             doc_file_path = f"{Path(file_path).stem}_docs.{format_type}"
         
         with open(doc_file_path, 'w') as f:
-            f.write(docs_content)
+            f.write(''.join(parts))
         
         return TaskResult(
             success=True,
@@ -115,6 +123,16 @@ class DocumentationAgent(Agent):
             output_message=f"Generated documentation for {file_path} in {doc_file_path}"
         )
     
+    async def _generate_function_docs_async(self, prompts: List[str]) -> List[str]:
+        """Generate documentation for all prompts concurrently, preserving order"""
+        semaphore = asyncio.Semaphore(self.config.performance.max_parallel_llm_calls)
+        
+        async def _doc_one(prompt: str) -> str:
+            async with semaphore:
+                return await self.llm_provider.agenerate_code(prompt)
+        
+        return await asyncio.gather(*(_doc_one(prompt) for prompt in prompts))
+    
     def _generate_symbol_docs(self, symbol: str, format_type: str, output_path: str, include_examples: bool, context_file: str = None) -> TaskResult:
         """Generate documentation for a specific symbol (function/class)"""
         # For now, return a simple implementation
@@ -134,15 +152,3 @@ class DocumentationAgent(Agent):
             modified_files=[],
             output_message=f"Generated documentation for symbol '{symbol}' in {doc_file_path}"
         )
-    
-    def _find_project_root(self, file_path: str) -> str:
-        """Find project root directory"""
-        path = Path(file_path).parent
-        indicators = ['setup.py', 'pyproject.toml', 'package.json', '.git']
-        
-        while path != path.parent:
-            if any((path / indicator).exists() for indicator in indicators):
-                return str(path)
-            path = path.parent
-        
-        return str(Path(file_path).parent)
\ No newline at end of file
@@ -1,9 +1,12 @@
 """Code generation agent implementation"""
 
+import os
+import threading
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable
 
-from devagent.core.interfaces import Agent, Task, TaskResult
+from devagent.core.interfaces import Agent, Task, TaskResult, LLMProvider
+from devagent.core.paths import find_project_root
 from devagent.context.context_engine import DevAgentContextEngine
 from devagent.llm.providers import LLMProviderFactory
 from devagent.llm.prompts import GeneralPrompts
@@ -12,20 +15,12 @@ from devagent.llm.prompts import GeneralPrompts
 class GenerationAgent(Agent):
     """Agent for generating code from a prompt"""
 
-    def __init__(self, config):
+    def __init__(self, config, llm_provider: Optional[LLMProvider] = None):
         self.config = config
-        try:
-            self.llm_provider = LLMProviderFactory.create_provider(
-                config.llm.provider,
-                model=config.llm.model,
-                api_key_env=config.llm.api_key_env,
-                max_tokens=config.llm.max_tokens,
-                temperature=config.llm.temperature
-            )
-        except Exception:
-            # Fallback to mock provider if real provider fails
-            self.llm_provider = LLMProviderFactory.create_provider('mock')
-        self.context_engine = None
+        if llm_provider is not None:
+            self.llm_provider = llm_provider
+        else:
+            self.llm_provider = LLMProviderFactory.create_provider_with_fallback(config.llm)
 
     def execute_task(self, task: Task) -> TaskResult:
         """Execute code generation task"""
@@ -34,25 +29,28 @@ class GenerationAgent(Agent):
             output_path = task.parameters.get('output')
             context_file = task.parameters.get('context')
 
-            # Initialize context engine
-            project_path = self._find_project_root(output_path or ".")
-            self.context_engine = DevAgentContextEngine(project_path)
+            # Initialize context engine; kept local since one agent serves concurrent tasks
+            project_path = find_project_root(str(Path(output_path or ".").parent))
+            context_engine = DevAgentContextEngine(
+                project_path,
+                embedding_backend=self.config.indexing.embedding_backend,
+                vector_backend=self.config.indexing.vector_backend
+            )
 
             # Get context
             context = []
             if context_file:
-                context = self.context_engine.get_file_context(context_file)
+                context = context_engine.get_file_context(context_file)
 
-            # Generate code
-            generated_code = self.llm_provider.generate_code(prompt, context=self._format_context(context))
+            # Generate code, writing it out as it streams in
+            stream = self.llm_provider.stream_generate(prompt, context=self._format_context(context))
 
-            # Save generated code
             if output_path:
-                with open(output_path, 'w') as f:
-                    f.write(generated_code)
+                _write_stream(output_path, stream)
                 generated_files = [output_path]
                 output_message = f"Generated code saved to {output_path}"
             else:
+                generated_code = ''.join(stream)
                 generated_files = []
                 output_message = f"Generated code:\n\n{generated_code}"
 
@@ -71,18 +69,6 @@ class GenerationAgent(Agent):
                 output_message=f"Code generation failed: {str(e)}"
             )
 
-    def _find_project_root(self, file_path: str) -> str:
-        """Find project root directory"""
-        path = Path(file_path).parent
-        indicators = ['setup.py', 'pyproject.toml', 'package.json', '.git']
-
-        while path != path.parent:
-            if any((path / indicator).exists() for indicator in indicators):
-                return str(path)
-            path = path.parent
-
-        return str(Path(file_path).parent)
-
     def _format_context(self, context: List[Dict[str, Any]]) -> str:
         """Format context for the LLM prompt"""
         if not context:
@@ -94,3 +80,23 @@ class GenerationAgent(Agent):
             context_str += f"```\n{chunk.content}\n```\n\n"
 
         return context_str
+
+
+def _write_stream(output_path: str, stream: Iterable[str]) -> None:
+    """Write streamed chunks to a file, replacing it only once the stream completes
+
+    Chunks go to a temporary file next to the output, so a failed or
+    interrupted generation leaves any existing file untouched.
+    """
+    tmp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            for chunk in stream:
+                f.write(chunk)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -1,46 +1,86 @@
 """Agentic workflow orchestration"""
 
-from typing import Dict, Any, List, Optional
+import os
+import json
+import asyncio
+import hashlib
+import threading
+from dataclasses import asdict
+from typing import Dict, Any, List, Optional, Callable
 from devagent.core.interfaces import Agent, Task, TaskResult
 from devagent.core.config import ConfigManager
+from devagent.core.paths import find_project_root
 from devagent.agent.test_agent import TestGenerationAgent
 from devagent.agent.docs_agent import DocumentationAgent
 from devagent.agent.refactor_agent import RefactoringAgent
 from devagent.agent.generation_agent import GenerationAgent
 from devagent.agent.analysis_agent import AnalysisAgent
+from devagent.llm.providers import LLMProviderFactory
+from devagent.llm.dispatcher import LLMDispatcher
 
 
 class AgentOrchestrator:
     """Orchestrates different agents for complex workflows"""
     
+    # Relative to the project root; one checkpoint file per workflow
+    WORKFLOW_CHECKPOINT_DIR = os.path.join(".devagent", "workflows")
+    
     def __init__(self, config_manager: ConfigManager):
         self.config_manager = config_manager
         self.config = config_manager.config
         
-        # Initialize agents with error handling
-        self.agents = {}
-        try:
-            self.agents['test'] = TestGenerationAgent(self.config)
-            self.agents['docs'] = DocumentationAgent(self.config)
-            self.agents['refactor'] = RefactoringAgent(self.config)
-            self.agents['generate'] = GenerationAgent(self.config)
-            self.agents['analyze'] = AnalysisAgent(self.config)
-        except Exception as e:
-            # If agents can't be initialized (e.g., missing API keys), create mock versions
-            from devagent.llm.providers import MockLLMProvider
-            mock_config = self.config
-            mock_config.llm.provider = 'mock'
-            
-            self.agents['test'] = TestGenerationAgent(mock_config)
-            self.agents['docs'] = DocumentationAgent(mock_config)
-            self.agents['refactor'] = RefactoringAgent(mock_config)
-            self.agents['generate'] = GenerationAgent(mock_config)
-            self.agents['analyze'] = AnalysisAgent(mock_config)
+        # Agents and the shared LLM dispatcher are created on first use, so
+        # commands that never call an LLM never probe a provider
+        self._dispatcher = None
+        self._agents: Dict[str, Agent] = {}
+        self._dispatch: Dict[str, Callable[[Task], TaskResult]] = {}
+        self._lock = threading.Lock()
+        self._agent_factories = {
+            'test': lambda: TestGenerationAgent(self.config),
+            'docs': lambda: DocumentationAgent(self.config, llm_provider=self.dispatcher),
+            'refactor': lambda: RefactoringAgent(self.config, llm_provider=self.dispatcher),
+            'generate': lambda: GenerationAgent(self.config, llm_provider=self.dispatcher),
+            'analyze': lambda: AnalysisAgent(self.config),
+        }
+        # Concurrent workflow tasks must not build the same agent twice
+        self._agent_locks = {command: threading.Lock() for command in self._agent_factories}
+    
+    @property
+    def dispatcher(self) -> LLMDispatcher:
+        """Shared LLM dispatcher, so all agents pool their requests"""
+        with self._lock:
+            if self._dispatcher is None:
+                self._dispatcher = LLMDispatcher(
+                    self._create_llm_provider(),
+                    max_parallel_requests=self.config.performance.max_parallel_llm_calls
+                )
+            return self._dispatcher
+    
+    def get_agent(self, command: str) -> Optional[Agent]:
+        """Get the agent for a command, creating it on first use"""
+        factory = self._agent_factories.get(command)
+        if factory is None:
+            return None
+        
+        agent = self._agents.get(command)
+        if agent is None:
+            with self._agent_locks[command]:
+                agent = self._agents.get(command)
+                if agent is None:
+                    agent = factory()
+                    # Bind the agent's method once so later tasks skip the lookups
+                    self._dispatch[command] = agent.execute_task
+                    self._agents[command] = agent
+        return agent
+    
+    def _create_llm_provider(self):
+        """Create the configured LLM provider, falling back to the mock provider"""
+        return LLMProviderFactory.create_provider_with_fallback(self.config.llm)
     
     def execute_task(self, task: Task) -> TaskResult:
         """Execute task using appropriate agent"""
-        agent = self.agents.get(task.command)
-        if not agent:
+        execute = self._dispatch.get(task.command)
+        if execute is None and task.command not in self._agent_factories:
             return TaskResult(
                 success=False,
                 generated_files=[],
@@ -49,7 +89,9 @@ class AgentOrchestrator:
             )
         
         try:
-            return agent.execute_task(task)
+            if execute is None:
+                execute = self.get_agent(task.command).execute_task
+            return execute(task)
         except Exception as e:
             return TaskResult(
                 success=False,
@@ -59,15 +101,142 @@ class AgentOrchestrator:
             )
     
     def execute_workflow(self, tasks: List[Task]) -> List[TaskResult]:
-        """Execute multiple tasks in sequence"""
-        results = []
+        """Execute multiple tasks, running independent tasks concurrently"""
+        return asyncio.run(self.execute_workflow_async(tasks))
+    
+    async def execute_workflow_async(self, tasks: List[Task]) -> List[TaskResult]:
+        """Execute tasks level by level over their dependency graph
+        
+        A task may list the indices of tasks it needs in
+        ``parameters['depends_on']``. Every task whose dependencies are
+        satisfied is dispatched concurrently; results are returned in the
+        original task order. A failed critical task stops scheduling.
+        
+        Successful results are appended to a checkpoint file as they
+        complete, so a run that is interrupted, or stopped by a critical
+        failure, resumes without repeating finished tasks. The checkpoint is
+        kept per project and task list, and a result is only reused while the
+        task's target file is as the task left it. It is removed once a run
+        finishes.
+        """
+        checkpoint_path = self._checkpoint_path(tasks)
+        task_ids = [self._task_id(task) for task in tasks]
+        completed = self._load_checkpoint(checkpoint_path)
         
-        for task in tasks:
-            result = self.execute_task(task)
-            results.append(result)
+        results: Dict[int, TaskResult] = {}
+        pending = {}
+        for index, task in enumerate(tasks):
+            if task_ids[index] in completed:
+                results[index] = completed[task_ids[index]]
+            else:
+                pending[index] = set(task.parameters.get('depends_on', []))
+        
+        async def run_task(index: int):
+            try:
+                return index, await asyncio.to_thread(self.execute_task, tasks[index])
+            except Exception as e:
+                return index, _failed_result(f"Task execution failed: {str(e)}")
+        
+        stopped = False
+        while pending:
+            ready = [index for index, deps in pending.items() if deps.issubset(results)]
+            if not ready:
+                for index in pending:
+                    results[index] = _failed_result("Task dependencies could not be resolved")
+                pending = {}
+                break
             
-            # Stop on failure if task is critical
-            if not result.success and task.parameters.get('critical', False):
+            # Tasks whose dependencies failed are not run
+            runnable = []
+            for index in ready:
+                deps = pending.pop(index)
+                if all(results[dep].success for dep in deps):
+                    runnable.append(index)
+                else:
+                    results[index] = _failed_result("Task skipped: dependency failed")
+            
+            for next_result in asyncio.as_completed([run_task(index) for index in runnable]):
+                index, result = await next_result
+                results[index] = result
+                if result.success:
+                    # Keyed by the target file as this task left it
+                    self._append_checkpoint(checkpoint_path, self._task_id(tasks[index]), result)
+                
+                # Stop on failure if task is critical
+                if not result.success and tasks[index].parameters.get('critical', False):
+                    stopped = True
+            
+            if stopped:
                 break
         
-        return results
\ No newline at end of file
+        # Every task gets a result, so results line up with tasks
+        for index in pending:
+            results[index] = _failed_result("Task skipped: workflow stopped after a critical failure")
+        
+        # A run stopped by a critical failure keeps its checkpoint to resume from
+        if not stopped:
+            self._clear_checkpoint(checkpoint_path)
+        return [results[index] for index in range(len(tasks))]
+    
+    @staticmethod
+    def _task_id(task: Task) -> str:
+        """Get an identifier for a task and the current state of its target file"""
+        target_state = None
+        if task.target_file:
+            try:
+                stat = os.stat(task.target_file)
+                target_state = [stat.st_mtime_ns, stat.st_size]
+            except OSError:
+                target_state = []
+        
+        data = json.dumps([asdict(task), target_state], sort_keys=True, default=str).encode('utf-8')
+        return hashlib.blake2b(data, digest_size=32).hexdigest()
+    
+    def _checkpoint_path(self, tasks: List[Task]) -> str:
+        """Get the checkpoint file for a task list, under its project's .devagent directory"""
+        cwd = os.getcwd()
+        data = json.dumps([cwd, [asdict(task) for task in tasks]], sort_keys=True, default=str)
+        workflow_id = hashlib.blake2b(data.encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(find_project_root(cwd), self.WORKFLOW_CHECKPOINT_DIR, f"{workflow_id}.jsonl")
+    
+    def _load_checkpoint(self, checkpoint_path: str) -> Dict[str, TaskResult]:
+        """Load results recorded by an interrupted workflow run"""
+        completed = {}
+        try:
+            with open(checkpoint_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        completed[entry['id']] = TaskResult(**entry['result'])
+                    except (ValueError, KeyError, TypeError):
+                        # Skip a line truncated by the interruption
+                        continue
+        except OSError:
+            pass
+        return completed
+    
+    def _append_checkpoint(self, checkpoint_path: str, task_id: str, result: TaskResult) -> None:
+        """Record a completed task in the checkpoint file"""
+        try:
+            os.makedirs(os.path.dirname(checkpoint_path), exist_ok=True)
+            with open(checkpoint_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'id': task_id, 'result': asdict(result)}, default=str) + "\n")
+        except OSError as e:
+            print(f"Warning: Could not write workflow checkpoint: {e}")
+    
+    def _clear_checkpoint(self, checkpoint_path: str) -> None:
+        """Remove the checkpoint file after a finished run"""
+        try:
+            os.remove(checkpoint_path)
+        except OSError:
+            pass
+
+
+def _failed_result(message: str) -> TaskResult:
+    """Build the result of a task that failed or was not run"""
+    return TaskResult(
+        success=False,
+        generated_files=[],
+        modified_files=[],
+        output_message=message
+    )
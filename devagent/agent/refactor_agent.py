@@ -4,7 +4,8 @@ import shutil
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
-from devagent.core.interfaces import Agent, Task, TaskResult
+from devagent.core.interfaces import Agent, Task, TaskResult, LLMProvider
+from devagent.core.paths import find_project_root
 from devagent.analysis.analyzer_factory import AnalyzerFactory
 from devagent.context.context_engine import DevAgentContextEngine
 from devagent.llm.providers import LLMProviderFactory
@@ -15,20 +16,12 @@ from devagent.core.validation import CodeValidator
 class RefactoringAgent(Agent):
     """Agent for intelligent code refactoring"""
     
-    def __init__(self, config):
+    def __init__(self, config, llm_provider: Optional[LLMProvider] = None):
         self.config = config
-        try:
-            self.llm_provider = LLMProviderFactory.create_provider(
-                config.llm.provider,
-                model=config.llm.model,
-                api_key_env=config.llm.api_key_env,
-                max_tokens=config.llm.max_tokens,
-                temperature=config.llm.temperature
-            )
-        except Exception:
-            # Fallback to mock provider if real provider fails
-            self.llm_provider = LLMProviderFactory.create_provider('mock')
-        self.context_engine = None
+        if llm_provider is not None:
+            self.llm_provider = llm_provider
+        else:
+            self.llm_provider = LLMProviderFactory.create_provider_with_fallback(config.llm)
         self.code_validator = CodeValidator()
     
     def execute_task(self, task: Task) -> TaskResult:
@@ -40,18 +33,22 @@ class RefactoringAgent(Agent):
             preview = task.parameters.get('preview', False)
             backup = task.parameters.get('backup', True)
             
-            # Initialize context engine
-            project_path = self._find_project_root(file_path)
-            self.context_engine = DevAgentContextEngine(project_path)
+            # Initialize context engine; kept local since one agent serves concurrent tasks
+            project_path = find_project_root(str(Path(file_path).parent))
+            context_engine = DevAgentContextEngine(
+                project_path,
+                embedding_backend=self.config.indexing.embedding_backend,
+                vector_backend=self.config.indexing.vector_backend
+            )
             
             # Create backup if requested and not in preview mode
             if backup and not preview:
                 self._create_backup(file_path)
             
             if function_name:
-                return self._refactor_function(file_path, function_name, refactor_type, preview)
+                return self._refactor_function(file_path, function_name, refactor_type, preview, context_engine)
             else:
-                return self._refactor_file(file_path, refactor_type, preview)
+                return self._refactor_file(file_path, refactor_type, preview, context_engine)
                 
         except Exception as e:
             return TaskResult(
@@ -61,7 +58,8 @@ class RefactoringAgent(Agent):
                 output_message=f"Refactoring failed: {str(e)}"
             )
     
-    def _refactor_function(self, file_path: str, function_name: str, refactor_type: str, preview: bool) -> TaskResult:
+    def _refactor_function(self, file_path: str, function_name: str, refactor_type: str, preview: bool,
+                           context_engine: DevAgentContextEngine) -> TaskResult:
         """Refactor a specific function"""
         # Analyze the function
         analyzer = AnalyzerFactory.create_analyzer(file_path)
@@ -73,10 +71,10 @@ class RefactoringAgent(Agent):
         # Get function code
         with open(file_path, 'r') as f:
             lines = f.readlines()
-            original_code = ''.join(lines[function_analysis.start_line-1:function_analysis.end_line])
+        original_code = ''.join(lines[function_analysis.start_line-1:function_analysis.end_line])
         
         # Get context
-        context = self.context_engine.get_function_context(file_path, function_name, k=5)
+        context = context_engine.get_function_context(file_path, function_name, k=5)
         
         # Generate refactoring prompt
         language = AnalyzerFactory.detect_language(file_path)
@@ -95,7 +93,12 @@ class RefactoringAgent(Agent):
         # Validate refactored code
         is_valid, errors = self.code_validator.validate_code_syntax(refactored_code, language)
         if not is_valid:
-            # Try to fix issues
+            # Try cheap local fixes before asking the LLM
+            repaired_code = self.code_validator.repair_code_syntax(refactored_code, language)
+            if repaired_code is not None:
+                refactored_code = repaired_code
+                is_valid = True
+        if not is_valid:
             fix_prompt = f"Fix syntax errors in refactored code:\n\nErrors: {errors}\n\nCode:\n{refactored_code}\n\nGenerate corrected code:"
             refactored_code = self.llm_provider.generate_code(fix_prompt)
         
@@ -112,11 +115,7 @@ class RefactoringAgent(Agent):
                 }
             )
         else:
-            # Apply refactoring
-            with open(file_path, 'r') as f:
-                lines = f.readlines()
-            
-            # Replace the function in the file using line numbers
+            # Apply refactoring, replacing the function using line numbers
             start_line = function_analysis.start_line - 1
             end_line = function_analysis.end_line
 
@@ -138,13 +137,14 @@ class RefactoringAgent(Agent):
                 }
             )
     
-    def _refactor_file(self, file_path: str, refactor_type: str, preview: bool) -> TaskResult:
+    def _refactor_file(self, file_path: str, refactor_type: str, preview: bool,
+                       context_engine: DevAgentContextEngine) -> TaskResult:
         """Refactor entire file"""
         with open(file_path, 'r') as f:
             original_code = f.read()
         
         # Get context
-        context = self.context_engine.get_file_context(file_path)
+        context = context_engine.get_file_context(file_path)
         
         # Generate refactoring prompt
         language = AnalyzerFactory.detect_language(file_path)
@@ -192,19 +192,10 @@ class RefactoringAgent(Agent):
             )
     
     def _create_backup(self, file_path: str) -> str:
-        """Create backup of file before refactoring"""
+        """Create backup of file before refactoring
+        
+        Only the contents are needed for rollback, so metadata is not copied.
+        """
         backup_path = f"{file_path}.backup"
-        shutil.copy2(file_path, backup_path)
+        shutil.copyfile(file_path, backup_path)
         return backup_path
-    
-    def _find_project_root(self, file_path: str) -> str:
-        """Find project root directory"""
-        path = Path(file_path).parent
-        indicators = ['setup.py', 'pyproject.toml', 'package.json', '.git']
-        
-        while path != path.parent:
-            if any((path / indicator).exists() for indicator in indicators):
-                return str(path)
-            path = path.parent
-        
-        return str(Path(file_path).parent)
\ No newline at end of file
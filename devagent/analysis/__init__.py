@@ -2,10 +2,12 @@
 
 from .python_analyzer import PythonASTAnalyzer, PythonFrameworkDetector
 from .javascript_analyzer import JavaScriptAnalyzer, JavaScriptFrameworkDetector
+from .incremental import IncrementalAnalyzer
 
 __all__ = [
     'PythonASTAnalyzer',
     'PythonFrameworkDetector', 
     'JavaScriptAnalyzer',
-    'JavaScriptFrameworkDetector'
+    'JavaScriptFrameworkDetector',
+    'IncrementalAnalyzer'
 ]
\ No newline at end of file
@@ -1,11 +1,13 @@
 """Factory for creating appropriate code analyzers"""
 
+import functools
 from pathlib import Path
-from typing import Optional
+from typing import Optional, List
 
 from devagent.core.interfaces import CodeAnalyzer
+from devagent.core.models import FunctionAnalysis
 from .python_analyzer import PythonASTAnalyzer, PythonFrameworkDetector
-from .javascript_analyzer import JavaScriptAnalyzer, JavaScriptFrameworkDetector
+from .javascript_analyzer import JavaScriptAnalyzer, JavaScriptFrameworkDetector, TS_LANGUAGES
 
 
 class AnalyzerFactory:
@@ -19,6 +21,14 @@ class AnalyzerFactory:
         '.tsx': JavaScriptAnalyzer,
     }
     
+    LANGUAGE_MAP = {
+        '.py': 'python',
+        '.js': 'javascript',
+        '.jsx': 'javascript',
+        '.ts': 'typescript',
+        '.tsx': 'typescript',
+    }
+    
     FRAMEWORK_DETECTOR_MAP = {
         'python': PythonFrameworkDetector,
         'javascript': JavaScriptFrameworkDetector,
@@ -27,23 +37,26 @@ class AnalyzerFactory:
     
     @classmethod
     def create_analyzer(cls, file_path: str) -> Optional[CodeAnalyzer]:
-        """Create appropriate analyzer for file type"""
-        path = Path(file_path)
-        extension = path.suffix.lower()
+        """Create appropriate analyzer for file type
         
-        analyzer_class = cls.ANALYZER_MAP.get(extension)
-        if analyzer_class:
-            # For JavaScript/TypeScript, check if tree-sitter is available
-            if analyzer_class == JavaScriptAnalyzer:
-                try:
-                    return analyzer_class()
-                except ImportError:
-                    print(f"Warning: Tree-sitter not available for {file_path}, skipping JavaScript analysis")
-                    return None
-            else:
-                return analyzer_class()
+        Analyzers are stateless, so one instance is shared per extension.
+        """
+        extension = Path(file_path).suffix.lower()
+        analyzer = _cached_analyzer(extension)
+        if analyzer is None and cls.ANALYZER_MAP.get(extension) == JavaScriptAnalyzer:
+            print(f"Warning: Tree-sitter not available for {file_path}, skipping JavaScript analysis")
+        return analyzer
+    
+    @classmethod
+    def analyze_functions(cls, file_path: str, function_names: List[str]) -> List[FunctionAnalysis]:
+        """Analyze several functions of a file, in order
         
-        return None
+        The file is parsed once and cached by its analyzer, so each function
+        after the first costs microseconds; a worker pool would only add
+        start-up and pickling overhead.
+        """
+        analyzer = cls.create_analyzer(file_path)
+        return [analyzer.analyze_function(file_path, name) for name in function_names]
     
     @classmethod
     def create_framework_detector(cls, language: str):
@@ -62,34 +75,40 @@ class AnalyzerFactory:
     @classmethod
     def is_supported(cls, file_path: str) -> bool:
         """Check if file type is supported"""
-        path = Path(file_path)
-        extension = path.suffix.lower()
-        
-        if extension not in cls.ANALYZER_MAP:
-            return False
-        
-        # For JavaScript/TypeScript, check if tree-sitter is available
-        if cls.ANALYZER_MAP[extension] == JavaScriptAnalyzer:
-            try:
-                import tree_sitter_javascript
-                import tree_sitter_typescript
-                return True
-            except ImportError:
-                return False
-        
-        return True
+        return _is_supported_extension(Path(file_path).suffix.lower())
     
     @classmethod
     def detect_language(cls, file_path: str) -> Optional[str]:
         """Detect programming language from file extension"""
-        path = Path(file_path)
-        extension = path.suffix.lower()
-        
-        if extension == '.py':
-            return 'python'
-        elif extension in ['.js', '.jsx']:
-            return 'javascript'
-        elif extension in ['.ts', '.tsx']:
-            return 'typescript'
-        
-        return None
\ No newline at end of file
+        return cls.LANGUAGE_MAP.get(Path(file_path).suffix.lower())
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_analyzer(extension: str) -> Optional[CodeAnalyzer]:
+    """Create (once) the analyzer for an extension"""
+    analyzer_class = AnalyzerFactory.ANALYZER_MAP.get(extension)
+    if not analyzer_class:
+        return None
+    
+    # For JavaScript/TypeScript, check if tree-sitter is available
+    if analyzer_class == JavaScriptAnalyzer:
+        try:
+            return analyzer_class()
+        except ImportError:
+            return None
+    
+    return analyzer_class()
+
+
+@functools.lru_cache(maxsize=64)
+def _is_supported_extension(extension: str) -> bool:
+    """Check if an extension has a usable analyzer"""
+    analyzer_class = AnalyzerFactory.ANALYZER_MAP.get(extension)
+    if analyzer_class is None:
+        return False
+    
+    # For JavaScript/TypeScript, check if tree-sitter is available
+    if analyzer_class == JavaScriptAnalyzer:
+        return bool(TS_LANGUAGES)
+    
+    return True
@@ -0,0 +1,125 @@
+"""Persistent cache of parsed Python syntax trees"""
+
+import os
+import ast
+import sys
+import pickle
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional, Tuple, Dict, Union
+
+
+class ASTCache:
+    """On-disk store of pickled ASTs keyed by a hash of the source
+
+    Keys also cover the interpreter version and parse flags, since the shape
+    of the tree differs between Python releases.
+    """
+
+    PARSE_FLAGS = ast.PyCF_ONLY_AST | ast.PyCF_ALLOW_TOP_LEVEL_AWAIT
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        if cache_dir is None:
+            cache_dir = os.path.expanduser("~/.devagent/ast_cache")
+
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def load(self, file_path: str) -> Tuple[bytes, ast.Module]:
+        """Read a file's raw bytes and get its tree, parsing only on a cache miss
+
+        The parser decodes the bytes itself, honouring any coding declaration,
+        so the source is never decoded separately.
+        """
+        with open(file_path, 'rb') as f:
+            data = f.read()
+
+        key = self.make_key(data)
+        tree = self._read_entry(key)
+
+        if tree is not None:
+            self._count(hit=True)
+            return data, tree
+
+        self._count(hit=False)
+        tree = self.parse(data, file_path)
+        self._write_entry(key, tree)
+        return data, tree
+
+    def parse(self, content: Union[str, bytes], file_path: str = '<unknown>') -> ast.Module:
+        """Parse source into a tree
+
+        Calls compile directly so the flags are explicit and nothing is
+        inherited from this module. No optimize level is passed, since on
+        newer Pythons that folds constants in the returned tree.
+        """
+        return compile(content, file_path, 'exec', self.PARSE_FLAGS, dont_inherit=True)
+
+    def make_key(self, data: bytes) -> str:
+        """Build the cache key for raw source bytes"""
+        digest = hashlib.sha256(data)
+        digest.update(f"{sys.version_info[:3]}:{self.PARSE_FLAGS}".encode('ascii'))
+        return digest.hexdigest()
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit and miss counts for this process"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    def clear(self) -> None:
+        """Remove all cached trees"""
+        for entry_path in self.cache_dir.glob('*/*.pkl'):
+            try:
+                entry_path.unlink()
+            except OSError:
+                pass
+
+    def _count(self, hit: bool) -> None:
+        """Record a lookup result"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _read_entry(self, key: str) -> Optional[ast.Module]:
+        """Read a tree from disk"""
+        try:
+            with open(self._entry_path(key), 'rb') as f:
+                tree = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return None
+
+        return tree if isinstance(tree, ast.Module) else None
+
+    def _write_entry(self, key: str, tree: ast.Module) -> None:
+        """Write a tree to disk"""
+        entry_path = self._entry_path(key)
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = entry_path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(tree, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, entry_path)
+        except (OSError, pickle.PicklingError, RecursionError) as e:
+            print(f"Warning: Could not write AST cache entry: {e}")
+
+    def _entry_path(self, key: str) -> Path:
+        """Get the on-disk location of an entry"""
+        return self.cache_dir / key[:2] / f"{key}.pkl"
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_ast_cache() -> ASTCache:
+    """Get the process-wide AST cache"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ASTCache()
+        return _default_cache
@@ -0,0 +1,97 @@
+"""Incremental re-analysis of Python files"""
+
+import os
+from typing import Optional
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+from .python_analyzer import PythonASTAnalyzer, _FileAnalysis
+
+
+class IncrementalAnalyzer(PythonASTAnalyzer):
+    """Python analyzer for long-lived sessions that only re-analyzes changed files
+
+    Results are kept per file and reused while the file's mtime and size are
+    unchanged. Once watch() is running, cached results are trusted without a
+    stat until the file system reports a change to the file.
+    """
+
+    __slots__ = ('_observer',)
+
+    ANALYSIS_CACHE_SIZE = 1000
+
+    def __init__(self, track_name_loads: bool = False, precise_defaults: bool = False):
+        super().__init__(track_name_loads, precise_defaults)
+        self._observer = None
+
+    def watch(self, project_path: str) -> bool:
+        """Start invalidating cached results from file system events
+
+        Returns False when watchdog is not installed; results are then still
+        checked against the file's stat on every call.
+        """
+        if Observer is None:
+            return False
+
+        self.stop()
+        observer = Observer()
+        observer.schedule(_InvalidatingHandler(self), project_path, recursive=True)
+        observer.daemon = True
+        observer.start()
+        self._observer = observer
+
+        # Anything cached before the watcher started is unverified
+        with self._cache_lock:
+            self._analysis_cache.clear()
+        return True
+
+    def stop(self) -> None:
+        """Stop watching for changes"""
+        observer, self._observer = self._observer, None
+        if observer is not None:
+            observer.stop()
+            observer.join()
+
+    def invalidate(self, path: str) -> None:
+        """Drop cached results for a file, or for every file under a directory"""
+        path = os.path.abspath(path)
+        prefix = path + os.sep
+
+        with self._cache_lock:
+            for cached_path in list(self._analysis_cache):
+                absolute = os.path.abspath(cached_path)
+                if absolute == path or absolute.startswith(prefix):
+                    del self._analysis_cache[cached_path]
+
+    def _analyze_file(self, file_path: str) -> _FileAnalysis:
+        """Analyze a file, skipping the stat while a watcher vouches for the cache"""
+        if self._observer is not None:
+            with self._cache_lock:
+                entry = self._analysis_cache.get(file_path)
+                if entry is not None:
+                    self._analysis_cache.move_to_end(file_path)
+                    return entry[2]
+
+        return super()._analyze_file(file_path)
+
+
+class _InvalidatingHandler(FileSystemEventHandler):
+    """Forward file system events to an IncrementalAnalyzer"""
+
+    def __init__(self, analyzer: IncrementalAnalyzer):
+        super().__init__()
+        self._analyzer = analyzer
+
+    def on_any_event(self, event):
+        if event.event_type in ('opened', 'closed_no_write'):
+            return
+
+        self._analyzer.invalidate(event.src_path)
+        dest_path: Optional[str] = getattr(event, 'dest_path', None)
+        if dest_path:
+            self._analyzer.invalidate(dest_path)
@@ -1,5 +1,7 @@
 """JavaScript/TypeScript code analysis using Tree-sitter"""
 
+from __future__ import annotations
+
 try:
     import tree_sitter_javascript as ts_js
     import tree_sitter_typescript as ts_ts
@@ -7,91 +9,228 @@ try:
     TREE_SITTER_AVAILABLE = True
 except ImportError:
     TREE_SITTER_AVAILABLE = False
-from typing import List, Dict, Any, Optional
-from pathlib import Path
+try:
+    from tree_sitter import Query, QueryCursor
+except ImportError:
+    # Older bindings compile queries with Language.query and run them directly
+    Query = QueryCursor = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+import os
+import copy
+import json
+import mmap
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 
 from devagent.core.interfaces import CodeAnalyzer
 from devagent.core.models import FunctionAnalysis, Parameter, FrameworkInfo
 
 
+def _load_languages() -> Dict[str, Any]:
+    """Load the tree-sitter grammars once per process"""
+    if not TREE_SITTER_AVAILABLE:
+        return {}
+    
+    try:
+        ts_grammar = ts_ts.language_typescript if hasattr(ts_ts, 'language_typescript') else ts_ts.language
+        grammars = {'js': ts_js.language(), 'ts': ts_grammar()}
+    except Exception as e:
+        print(f"Warning: Could not load tree-sitter grammars: {e}")
+        return {}
+    
+    try:
+        # Newer bindings need the Language wrapper
+        return {name: Language(grammar) for name, grammar in grammars.items()}
+    except Exception:
+        return grammars
+
+
+# Grammars shared by every analyzer instance; empty if tree-sitter is unavailable
+TS_LANGUAGES = _load_languages()
+
+
+# Node types looked up on every parameter
+PARAMETER_TYPES = frozenset({'identifier', 'required_parameter', 'optional_parameter'})
+
+
+QUERY_SOURCES = {
+    'function_names': """
+        (function_declaration name: (identifier) @name) @function
+        (method_definition name: (property_identifier) @name) @function
+    """,
+    'functions': "[(function_declaration) (method_definition) (arrow_function)] @function",
+    'classes': "(class_declaration) @class",
+    'imports': "(import_statement) @import (import_clause) @clause",
+    'function_body': """
+        [(if_statement) (while_statement) (for_statement) (for_in_statement) (catch_clause)
+         (ternary_expression)] @branch
+        (binary_expression operator: ["&&" "||"]) @logic
+        (call_expression function: [(identifier) (member_expression)] @callee)
+    """,
+}
+
+
+def _compile_query(language, source: str):
+    """Compile a query across tree-sitter API versions"""
+    if Query is not None:
+        return Query(language, source)
+    return language.query(source)
+
+
+def _query_matches(query, node) -> List[Dict[str, Any]]:
+    """Run a query on a node, returning one {capture name: node} dict per match"""
+    if QueryCursor is not None:
+        matches = QueryCursor(query).matches(node)
+    else:
+        matches = query.matches(node)
+    
+    return [
+        {name: nodes[0] if isinstance(nodes, list) else nodes for name, nodes in captures.items()}
+        for _, captures in matches
+    ]
+
+
+# Queries compiled once per grammar, keyed by grammar then query name
+TS_QUERIES = {
+    key: {name: _compile_query(language, source) for name, source in QUERY_SOURCES.items()}
+    for key, language in TS_LANGUAGES.items()
+}
+
+
+# Parsers are not safe to share between threads, so each thread keeps its own
+_thread_parsers = threading.local()
+
+
+def _create_parser(language) -> Parser:
+    """Create a parser for a language across tree-sitter API versions"""
+    try:
+        return Parser(language)
+    except TypeError:
+        # Fallback for older API
+        parser = Parser()
+        parser.set_language(language)
+        return parser
+
+
+def _common_prefix_length(a: bytes, b: bytes) -> int:
+    """Length of the common prefix of two byte strings"""
+    lo, hi = 0, min(len(a), len(b))
+    # Binary search with slice comparisons keeps the scanning in C
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix_length(a: bytes, b: bytes, limit: int) -> int:
+    """Length of the common suffix of two byte strings, at most limit"""
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:] == b[len(b) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _byte_point(content: bytes, offset: int) -> Tuple[int, int]:
+    """Convert a byte offset into a tree-sitter (row, column) point"""
+    row = content.count(b'\n', 0, offset)
+    return row, offset - (content.rfind(b'\n', 0, offset) + 1)
+
+
 class JavaScriptAnalyzer(CodeAnalyzer):
     """JavaScript/TypeScript code analyzer using Tree-sitter"""
     
+    TREE_CACHE_SIZE = 256
+    MMAP_THRESHOLD = 64 * 1024
+    
+    IMPORT_PREFIX_KINDS = {
+        '.': 'local',
+        '/': 'local',
+    }
+    
     def __init__(self):
-        if not TREE_SITTER_AVAILABLE:
+        if not TS_LANGUAGES:
             raise ImportError("Tree-sitter JavaScript/TypeScript parsers not available")
         
-        # Initialize Tree-sitter languages
-        try:
-            # Try the new API first
-            self.js_language = ts_js.language()
-            self.ts_language = ts_ts.language()
-        except Exception as e:
-            try:
-                # Try with Language wrapper
-                self.js_language = Language(ts_js.language())
-                self.ts_language = Language(ts_ts.language())
-            except Exception:
-                raise ImportError(f"Could not initialize tree-sitter languages: {e}")
-        
-        self.js_parser = Parser()
-        self.ts_parser = Parser()
+        self.js_language = TS_LANGUAGES['js']
+        self.ts_language = TS_LANGUAGES['ts']
         
-        try:
-            self.js_parser.set_language(self.js_language)
-            self.ts_parser.set_language(self.ts_language)
-        except:
-            # Fallback for older API
-            self.js_parser = Parser(self.js_language)
-            self.ts_parser = Parser(self.ts_language)
+        # file path -> (content digest, content, tree), in LRU order
+        self._tree_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
     
     def analyze_function(self, file_path: str, function_name: str) -> FunctionAnalysis:
         """Analyze a specific function in detail"""
-        with open(file_path, 'rb') as f:
-            content = f.read()
-        
-        parser = self._get_parser(file_path)
-        tree = parser.parse(content)
+        tree = self._parse(file_path)
         
-        function_node = self._find_function_node(tree.root_node, function_name)
+        function_node = self._find_function_node(tree.root_node, function_name, file_path)
         if not function_node:
             raise ValueError(f"Function '{function_name}' not found in {file_path}")
         
-        return self._analyze_function_node(function_node, file_path, content.decode('utf-8'))
+        return self._analyze_function_node(function_node, file_path, self._queries(file_path))
     
     def extract_functions(self, file_path: str) -> List[Dict[str, Any]]:
         """Extract all functions from a file"""
-        with open(file_path, 'rb') as f:
-            content = f.read()
-        
-        parser = self._get_parser(file_path)
-        tree = parser.parse(content)
-        
-        functions = []
-        self._extract_functions_recursive(tree.root_node, functions, content.decode('utf-8'))
-        
-        return functions
+        return list(self.iter_functions(file_path))
+    
+    def iter_functions(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """Yield functions from a file one at a time, analyzing each only when reached"""
+        tree = self._parse(file_path)
+        return self._iter_functions(tree.root_node, self._queries(file_path))
     
     def extract_classes(self, file_path: str) -> List[Dict[str, Any]]:
         """Extract all classes from a file"""
-        with open(file_path, 'rb') as f:
-            content = f.read()
-        
-        parser = self._get_parser(file_path)
-        tree = parser.parse(content)
-        
-        classes = []
-        self._extract_classes_recursive(tree.root_node, classes, content.decode('utf-8'))
-        
-        return classes
+        return list(self.iter_classes(file_path))
+    
+    def iter_classes(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """Yield classes from a file one at a time, analyzing each only when reached"""
+        tree = self._parse(file_path)
+        return self._iter_classes(tree.root_node, self._queries(file_path))
+    
+    def extract_functions_batch(self, file_paths: List[str], max_workers: Optional[int] = None,
+                                use_processes: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+        """Extract functions from many files in parallel
+        
+        Threads are used by default since tree-sitter releases the GIL while
+        parsing; ``use_processes`` spreads the Python-side tree walking over
+        processes instead. Files that cannot be analyzed are skipped.
+        """
+        max_workers = max_workers or os.cpu_count()
+        if use_processes:
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+            extract = _extract_functions_worker
+        else:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            extract = self.extract_functions
+        
+        results = {}
+        with executor:
+            futures = {executor.submit(extract, file_path): file_path for file_path in file_paths}
+            for future in as_completed(futures):
+                file_path = futures[future]
+                try:
+                    results[file_path] = future.result()
+                except Exception as e:
+                    print(f"Warning: Could not analyze {file_path}: {e}")
+        
+        return results
     
     def get_imports(self, file_path: str) -> Dict[str, List[str]]:
         """Extract all imports from a file"""
-        with open(file_path, 'rb') as f:
-            content = f.read()
-        
-        parser = self._get_parser(file_path)
-        tree = parser.parse(content)
+        tree = self._parse(file_path)
         
         imports = {
             'standard': [],
@@ -99,105 +238,180 @@ class JavaScriptAnalyzer(CodeAnalyzer):
             'local': []
         }
         
-        self._extract_imports_recursive(tree.root_node, imports, content.decode('utf-8'))
+        self._collect_imports(tree.root_node, imports, self._queries(file_path))
         
         return imports
     
+    def _parse(self, file_path: str):
+        """Parse a file, reusing the cached tree while its content is unchanged
+        
+        When the file has changed since it was cached, the old tree is edited
+        and handed to the parser so unchanged subtrees are reused. Large files
+        are hashed through a memory map, so a cache hit never copies them.
+        """
+        with self._cache_lock:
+            entry = self._tree_cache.get(file_path)
+            if entry is not None:
+                self._tree_cache.move_to_end(file_path)
+        
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size >= self.MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    digest = hashlib.sha256(mapped).digest()
+                    if entry is not None and entry[0] == digest:
+                        return entry[2]
+                    content = mapped[:]
+            else:
+                content = f.read()
+                digest = hashlib.sha256(content).digest()
+        
+        if entry is not None and entry[0] == digest:
+            return entry[2]
+        
+        parser = self._get_parser(file_path)
+        tree = None
+        if entry is not None:
+            try:
+                tree = parser.parse(content, self._edited_tree(entry[2], entry[1], content))
+            except Exception:
+                tree = None
+        if tree is None:
+            tree = parser.parse(content)
+        
+        with self._cache_lock:
+            self._tree_cache[file_path] = (digest, content, tree)
+            self._tree_cache.move_to_end(file_path)
+            while len(self._tree_cache) > self.TREE_CACHE_SIZE:
+                self._tree_cache.popitem(last=False)
+        
+        return tree
+    
+    def _edited_tree(self, old_tree, old_content: bytes, new_content: bytes):
+        """Copy a tree and apply the single edit that turns old content into new"""
+        start = _common_prefix_length(old_content, new_content)
+        suffix = _common_suffix_length(old_content, new_content, min(len(old_content), len(new_content)) - start)
+        old_end = len(old_content) - suffix
+        new_end = len(new_content) - suffix
+        
+        # Copy so callers still holding the cached tree are unaffected
+        tree = old_tree.copy()
+        tree.edit(
+            start_byte=start,
+            old_end_byte=old_end,
+            new_end_byte=new_end,
+            start_point=_byte_point(old_content, start),
+            old_end_point=_byte_point(old_content, old_end),
+            new_end_point=_byte_point(new_content, new_end)
+        )
+        return tree
+    
+    def _queries(self, file_path: str) -> Dict[str, Any]:
+        """Get the compiled queries for a file's grammar"""
+        return TS_QUERIES[self._language_key(file_path)]
+    
+    def _language_key(self, file_path: str) -> str:
+        """Get the grammar key for a file"""
+        return 'ts' if file_path.endswith('.ts') or file_path.endswith('.tsx') else 'js'
+    
     def _get_parser(self, file_path: str) -> Parser:
-        """Get appropriate parser based on file extension"""
-        if file_path.endswith('.ts') or file_path.endswith('.tsx'):
-            return self.ts_parser
-        else:
-            return self.js_parser
+        """Get appropriate parser based on file extension
+        
+        Parsers are created once per thread and reused for every file.
+        """
+        key = self._language_key(file_path)
+        
+        parsers = getattr(_thread_parsers, 'parsers', None)
+        if parsers is None:
+            parsers = _thread_parsers.parsers = {}
+        
+        parser = parsers.get(key)
+        if parser is None:
+            parser = parsers[key] = _create_parser(TS_LANGUAGES[key])
+        return parser
     
-    def _find_function_node(self, node: Node, function_name: str) -> Optional[Node]:
-        """Find a function node by name"""
-        if node.type in ['function_declaration', 'method_definition', 'arrow_function']:
-            name_node = self._get_function_name_node(node)
-            if name_node and self._get_node_text(name_node).decode('utf-8') == function_name:
-                return node
+    def _find_function_node(self, node: Node, function_name: str, file_path: str) -> Optional[Node]:
+        """Find a function node by name with a compiled query"""
+        target = function_name.encode('utf-8')
+        query = self._queries(file_path)['function_names']
         
-        for child in node.children:
-            result = self._find_function_node(child, function_name)
-            if result:
-                return result
+        for captures in _query_matches(query, node):
+            if self._get_node_text(captures['name']) == target:
+                return captures['function']
         
         return None
     
-    def _extract_functions_recursive(self, node: Node, functions: List[Dict[str, Any]], content: str):
-        """Recursively extract functions from AST"""
-        if node.type in ['function_declaration', 'method_definition', 'arrow_function']:
-            func_info = self._analyze_function_node(node, "", content)
-            functions.append({
+    def _iter_functions(self, node: Node, queries: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield functions from AST"""
+        for captures in _query_matches(queries['functions'], node):
+            func_info = self._analyze_function_node(captures['function'], "", queries)
+            yield {
                 'name': func_info.name,
                 'start_line': func_info.start_line,
                 'end_line': func_info.end_line,
                 'parameters': [{'name': p.name, 'type': p.type_hint} for p in func_info.parameters],
                 'return_type': func_info.return_type,
                 'complexity': func_info.complexity_score
-            })
-        
-        for child in node.children:
-            self._extract_functions_recursive(child, functions, content)
+            }
     
-    def _extract_classes_recursive(self, node: Node, classes: List[Dict[str, Any]], content: str):
-        """Recursively extract classes from AST"""
-        if node.type == 'class_declaration':
+    def _iter_classes(self, node: Node, queries: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield classes from AST"""
+        for captures in _query_matches(queries['classes'], node):
+            n = captures['class']
             class_info = {
-                'name': self._get_class_name(node, content),
-                'start_line': node.start_point[0] + 1,
-                'end_line': node.end_point[0] + 1,
+                'name': self._get_class_name(n),
+                'start_line': n.start_point[0] + 1,
+                'end_line': n.end_point[0] + 1,
                 'methods': [],
-                'extends': self._get_class_extends(node, content)
+                'extends': self._get_class_extends(n)
             }
             
             # Extract methods
-            for child in node.children:
+            for child in n.children:
                 if child.type == 'class_body':
                     for method_node in child.children:
                         if method_node.type == 'method_definition':
-                            method_info = self._analyze_function_node(method_node, "", content)
+                            method_info = self._analyze_function_node(method_node, "", queries)
                             class_info['methods'].append({
                                 'name': method_info.name,
                                 'parameters': [{'name': p.name, 'type': p.type_hint} for p in method_info.parameters],
                                 'return_type': method_info.return_type
                             })
             
-            classes.append(class_info)
-        
-        for child in node.children:
-            self._extract_classes_recursive(child, classes, content)
+            yield class_info
     
-    def _extract_imports_recursive(self, node: Node, imports: Dict[str, List[str]], content: str):
-        """Recursively extract imports from AST"""
-        if node.type == 'import_statement':
-            import_path = self._get_import_path(node, content)
-            if import_path:
-                imports[self._classify_import(import_path)].append(import_path)
-        
-        elif node.type == 'import_clause':
-            # Handle ES6 imports
-            import_path = self._get_import_path(node.parent, content)
+    def _collect_imports(self, node: Node, imports: Dict[str, List[str]],
+                                   queries: Dict[str, Any]):
+        """Extract imports from AST"""
+        for captures in _query_matches(queries['imports'], node):
+            if 'import' in captures:
+                import_path = self._get_import_path(captures['import'])
+            else:
+                # Handle ES6 imports
+                import_path = self._get_import_path(captures['clause'].parent)
+            
             if import_path:
                 imports[self._classify_import(import_path)].append(import_path)
-        
-        for child in node.children:
-            self._extract_imports_recursive(child, imports, content)
     
-    def _analyze_function_node(self, node: Node, file_path: str, content: str) -> FunctionAnalysis:
+    def _analyze_function_node(self, node: Node, file_path: str,
+                               queries: Dict[str, Any]) -> FunctionAnalysis:
         """Analyze a function node"""
         # Get function name
         name_node = self._get_function_name_node(node)
         name = self._get_node_text(name_node).decode('utf-8') if name_node else 'anonymous'
         
+        # Look up the parameter list and return type (for TypeScript) by field,
+        # which tree-sitter resolves natively without listing the children
+        params_node = self._get_field_of_type(node, 'parameters', 'formal_parameters')
+        return_type_node = self._get_field_of_type(node, 'return_type', 'type_annotation')
+        return_type = self._get_node_text(return_type_node).decode('utf-8') if return_type_node else None
+        
         # Extract parameters
         parameters = []
-        params_node = self._get_parameters_node(node)
         if params_node:
             for param_node in params_node.children:
-                if param_node.type in ['identifier', 'required_parameter', 'optional_parameter']:
+                if param_node.type in PARAMETER_TYPES:
                     param_name = self._get_node_text(param_node).decode('utf-8')
-                    param_type = self._get_parameter_type(param_node, content)
+                    param_type = self._get_parameter_type(param_node)
                     
                     parameters.append(Parameter(
                         name=param_name,
@@ -205,14 +419,8 @@ class JavaScriptAnalyzer(CodeAnalyzer):
                         is_required=param_node.type != 'optional_parameter'
                     ))
         
-        # Get return type (for TypeScript)
-        return_type = self._get_return_type(node, content)
-        
-        # Calculate complexity
-        complexity = self._calculate_complexity(node)
-        
-        # Find dependencies
-        dependencies = self._find_dependencies(node, content)
+        # Calculate complexity and find dependencies
+        complexity, dependencies = self._scan_function_body(node, queries)
         
         return FunctionAnalysis(
             name=name,
@@ -226,51 +434,40 @@ class JavaScriptAnalyzer(CodeAnalyzer):
             end_line=node.end_point[0] + 1
         )
     
+    def _get_field_of_type(self, node: Node, field: str, node_type: str) -> Optional[Node]:
+        """Get a node's field child if it has the expected type"""
+        child = node.child_by_field_name(field)
+        if child is not None and child.type == node_type:
+            return child
+        return None
+    
     def _get_function_name_node(self, node: Node) -> Optional[Node]:
         """Get the name node of a function"""
         if node.type == 'function_declaration':
-            for child in node.children:
-                if child.type == 'identifier':
-                    return child
+            return self._get_field_of_type(node, 'name', 'identifier')
         elif node.type == 'method_definition':
-            for child in node.children:
-                if child.type == 'property_identifier':
-                    return child
+            return self._get_field_of_type(node, 'name', 'property_identifier')
         elif node.type == 'arrow_function':
             # Arrow functions might not have names
             return None
         
         return None
     
-    def _get_parameters_node(self, node: Node) -> Optional[Node]:
-        """Get the parameters node of a function"""
-        for child in node.children:
-            if child.type == 'formal_parameters':
-                return child
-        return None
-    
-    def _get_parameter_type(self, param_node: Node, content: str) -> Optional[str]:
+    def _get_parameter_type(self, param_node: Node) -> Optional[str]:
         """Get parameter type annotation (TypeScript)"""
         for child in param_node.children:
             if child.type == 'type_annotation':
                 return self._get_node_text(child).decode('utf-8')
         return None
     
-    def _get_return_type(self, node: Node, content: str) -> Optional[str]:
-        """Get return type annotation (TypeScript)"""
-        for child in node.children:
-            if child.type == 'type_annotation':
-                return self._get_node_text(child).decode('utf-8')
-        return None
-    
-    def _get_class_name(self, node: Node, content: str) -> str:
+    def _get_class_name(self, node: Node) -> str:
         """Get class name"""
         for child in node.children:
             if child.type == 'type_identifier':
                 return self._get_node_text(child).decode('utf-8')
         return 'anonymous'
     
-    def _get_class_extends(self, node: Node, content: str) -> Optional[str]:
+    def _get_class_extends(self, node: Node) -> Optional[str]:
         """Get class extends clause"""
         for child in node.children:
             if child.type == 'class_heritage':
@@ -281,7 +478,7 @@ class JavaScriptAnalyzer(CodeAnalyzer):
                                 return self._get_node_text(extends_child).decode('utf-8')
         return None
     
-    def _get_import_path(self, node: Node, content: str) -> Optional[str]:
+    def _get_import_path(self, node: Node) -> Optional[str]:
         """Get import path from import statement"""
         for child in node.children:
             if child.type == 'string':
@@ -290,63 +487,46 @@ class JavaScriptAnalyzer(CodeAnalyzer):
                 return path.strip('"\'')
         return None
     
-    def _calculate_complexity(self, node: Node) -> int:
-        """Calculate cyclomatic complexity"""
+    def _scan_function_body(self, node: Node, queries: Dict[str, Any]) -> Tuple[int, List[str]]:
+        """Calculate cyclomatic complexity and find dependencies in one pass"""
         complexity = 1  # Base complexity
-        
-        def count_complexity(n: Node):
-            nonlocal complexity
-            if n.type in ['if_statement', 'while_statement', 'for_statement', 'for_in_statement']:
-                complexity += 1
-            elif n.type in ['catch_clause', 'case_clause']:
-                complexity += 1
-            elif n.type in ['conditional_expression', 'binary_expression']:
-                # Check for logical operators
-                text = self._get_node_text(n).decode('utf-8')
-                if '&&' in text or '||' in text:
-                    complexity += 1
-            
-            for child in n.children:
-                count_complexity(child)
-        
-        count_complexity(node)
-        return complexity
-    
-    def _find_dependencies(self, node: Node, content: str) -> List[str]:
-        """Find function dependencies"""
         dependencies = set()
         
-        def find_calls(n: Node):
-            if n.type == 'call_expression':
-                # Get function name being called
-                for child in n.children:
-                    if child.type == 'identifier':
-                        dependencies.add(self._get_node_text(child).decode('utf-8'))
-                        break
-                    elif child.type == 'member_expression':
-                        dependencies.add(self._get_node_text(child).decode('utf-8'))
-                        break
-            
-            for child in n.children:
-                find_calls(child)
+        for captures in _query_matches(queries['function_body'], node):
+            if 'branch' in captures or 'logic' in captures:
+                complexity += 1
+            else:
+                # Name of a function being called
+                dependencies.add(self._get_node_text(captures['callee']))
         
-        find_calls(node)
-        return list(dependencies)
+        # Decode each distinct name once
+        return complexity, [dependency.decode('utf-8') for dependency in dependencies]
     
     def _classify_import(self, import_path: str) -> str:
-        """Classify import as standard, third-party, or local"""
-        if import_path.startswith('.'):
-            return 'local'
-        elif import_path.startswith('@') or '/' not in import_path:
-            return 'third_party'
-        else:
-            return 'local'
+        """Classify import as standard, third-party, or local
+        
+        Relative and absolute paths are local; bare specifiers, including
+        scoped packages and package subpaths such as 'lodash/fp', are
+        third-party.
+        """
+        return self.IMPORT_PREFIX_KINDS.get(import_path[:1], 'third_party')
     
     def _get_node_text(self, node: Node) -> bytes:
         """Get text content of a node"""
         return node.text
 
 
+def _extract_functions_worker(file_path: str) -> List[Dict[str, Any]]:
+    """Extract functions in a process pool worker, reusing one analyzer per process"""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = JavaScriptAnalyzer()
+    return _worker_analyzer.extract_functions(file_path)
+
+
+_worker_analyzer = None
+
+
 class JavaScriptFrameworkDetector:
     """Detect JavaScript/TypeScript frameworks and testing libraries"""
     
@@ -371,88 +551,146 @@ class JavaScriptFrameworkDetector:
         'koa': ['koa', '@types/koa']
     }
     
+    TEST_CONFIG_FILES = [
+        'jest.config.js', 'jest.config.ts', 'jest.config.json',
+        'vitest.config.js', 'vitest.config.ts',
+        'cypress.config.js', 'cypress.config.ts',
+        'playwright.config.js', 'playwright.config.ts'
+    ]
+    
+    WEB_CONFIG_FILES = {
+        'angular.json': 'angular',
+        'next.config.js': 'next',
+        'nuxt.config.js': 'nuxt',
+    }
+    
+    CONFIG_FILES = frozenset(TEST_CONFIG_FILES) | frozenset(WEB_CONFIG_FILES)
+    
     def detect_testing_framework(self, project_path: str) -> FrameworkInfo:
-        """Detect the testing framework used in the project"""
-        project_dir = Path(project_path)
+        """Detect the testing framework used in the project
+        
+        Results are memoized until the project's file listing or its
+        package.json changes.
+        """
+        return copy.deepcopy(_memoized_detection(
+            type(self), '_detect_testing_framework', project_path, _project_change_key(project_path)
+        ))
+    
+    def detect_web_framework(self, project_path: str) -> Optional[FrameworkInfo]:
+        """Detect web framework used in the project
+        
+        Results are memoized until the project's file listing or its
+        package.json changes.
+        """
+        return copy.deepcopy(_memoized_detection(
+            type(self), '_detect_web_framework', project_path, _project_change_key(project_path)
+        ))
+    
+    def _detect_testing_framework(self, project_path: str) -> FrameworkInfo:
+        """Detect the testing framework without memoization"""
+        entries = _project_entries(project_path)
+        found_configs = self.CONFIG_FILES & entries
         
         # Check for configuration files
         config_files = []
-        test_configs = [
-            'jest.config.js', 'jest.config.ts', 'jest.config.json',
-            'vitest.config.js', 'vitest.config.ts',
-            'cypress.config.js', 'cypress.config.ts',
-            'playwright.config.js', 'playwright.config.ts'
-        ]
-        
-        for config in test_configs:
-            if (project_dir / config).exists():
-                config_files.append(config)
-                framework_name = config.split('.')[0]
-                return FrameworkInfo(framework_name, config_files=config_files)
+        if found_configs:
+            for config in self.TEST_CONFIG_FILES:
+                if config in found_configs:
+                    config_files.append(config)
+                    framework_name = config.split('.')[0]
+                    return FrameworkInfo(framework_name, config_files=config_files)
         
         # Check package.json
-        package_json = project_dir / 'package.json'
-        dependencies = []
-        
-        if package_json.exists():
-            try:
-                import json
-                with open(package_json, 'r') as f:
-                    data = json.load(f)
-                    
-                    deps = data.get('dependencies', {})
-                    dev_deps = data.get('devDependencies', {})
-                    dependencies = list(deps.keys()) + list(dev_deps.keys())
-            except Exception:
-                pass
+        dependencies, dependency_set = _package_dependencies(project_path, entries)
         
         # Determine framework based on dependencies
         for framework, indicators in self.TESTING_FRAMEWORKS.items():
-            for indicator in indicators:
-                if indicator in dependencies:
-                    return FrameworkInfo(
-                        framework,
-                        config_files=config_files,
-                        dependencies=dependencies
-                    )
+            if not dependency_set.isdisjoint(indicators):
+                return FrameworkInfo(
+                    framework,
+                    config_files=config_files,
+                    dependencies=list(dependencies)
+                )
         
         # Default to jest if no specific framework detected
         return FrameworkInfo('jest', config_files=config_files)
     
-    def detect_web_framework(self, project_path: str) -> Optional[FrameworkInfo]:
-        """Detect web framework used in the project"""
-        project_dir = Path(project_path)
+    def _detect_web_framework(self, project_path: str) -> Optional[FrameworkInfo]:
+        """Detect the web framework without memoization"""
+        entries = _project_entries(project_path)
         
         # Check package.json
-        package_json = project_dir / 'package.json'
-        dependencies = []
-        
-        if package_json.exists():
-            try:
-                import json
-                with open(package_json, 'r') as f:
-                    data = json.load(f)
-                    
-                    deps = data.get('dependencies', {})
-                    dev_deps = data.get('devDependencies', {})
-                    dependencies = list(deps.keys()) + list(dev_deps.keys())
-            except Exception:
-                pass
+        dependencies, dependency_set = _package_dependencies(project_path, entries)
         
         # Check for framework-specific files
-        if (project_dir / 'angular.json').exists():
-            return FrameworkInfo('angular', config_files=['angular.json'])
-        
-        if (project_dir / 'next.config.js').exists():
-            return FrameworkInfo('next', config_files=['next.config.js'])
-        
-        if (project_dir / 'nuxt.config.js').exists():
-            return FrameworkInfo('nuxt', config_files=['nuxt.config.js'])
+        found_configs = self.CONFIG_FILES & entries
+        if found_configs:
+            for config, framework in self.WEB_CONFIG_FILES.items():
+                if config in found_configs:
+                    return FrameworkInfo(framework, config_files=[config])
         
         # Determine framework based on dependencies
         for framework, indicators in self.WEB_FRAMEWORKS.items():
-            for indicator in indicators:
-                if indicator in dependencies:
-                    return FrameworkInfo(framework, dependencies=dependencies)
+            if not dependency_set.isdisjoint(indicators):
+                return FrameworkInfo(framework, dependencies=list(dependencies))
         
-        return None
\ No newline at end of file
+        return None
+
+
+def _project_change_key(project_path: str) -> Tuple[int, int]:
+    """Get modification times that change whenever detection results could"""
+    try:
+        dir_mtime = os.stat(project_path).st_mtime_ns
+    except OSError:
+        return 0, 0
+    try:
+        package_mtime = os.stat(os.path.join(project_path, 'package.json')).st_mtime_ns
+    except OSError:
+        package_mtime = 0
+    return dir_mtime, package_mtime
+
+
+@functools.lru_cache(maxsize=64)
+def _memoized_detection(detector_class, method_name: str, project_path: str,
+                        change_key: Tuple[int, int]) -> Optional[FrameworkInfo]:
+    """Run a framework detection once per project state"""
+    return getattr(detector_class(), method_name)(project_path)
+
+
+def _project_entries(project_path: str) -> frozenset:
+    """List the file names in a project directory with a single scandir"""
+    try:
+        with os.scandir(project_path) as entries:
+            return frozenset(entry.name for entry in entries if entry.is_file())
+    except OSError:
+        return frozenset()
+
+
+def _package_dependencies(project_path: str, entries: frozenset) -> Tuple[Tuple[str, ...], frozenset]:
+    """Get a project's package.json dependency names, in order and as a set"""
+    if 'package.json' not in entries:
+        return (), frozenset()
+    
+    package_json = os.path.join(project_path, 'package.json')
+    try:
+        mtime = os.stat(package_json).st_mtime_ns
+    except OSError:
+        return (), frozenset()
+    return _load_package_dependencies(package_json, mtime)
+
+
+@functools.lru_cache(maxsize=128)
+def _load_package_dependencies(package_json: str, mtime: int) -> Tuple[Tuple[str, ...], frozenset]:
+    """Parse package.json once per modification time"""
+    try:
+        with open(package_json, 'rb') as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        
+        deps = data.get('dependencies', {})
+        dev_deps = data.get('devDependencies', {})
+        dependencies = tuple(deps.keys()) + tuple(dev_deps.keys())
+    except Exception:
+        dependencies = ()
+    
+    return dependencies, frozenset(dependencies)
@@ -2,137 +2,297 @@
 
 import ast
 import os
-from typing import List, Dict, Any, Optional, Set
+import re
+import sys
+import math
+import builtins
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, deque
+from dataclasses import dataclass, replace
+from operator import itemgetter
+from typing import List, Dict, Any, Optional, Set, Tuple, FrozenSet, Final, Deque
 from pathlib import Path
 
 from devagent.core.interfaces import CodeAnalyzer
-from devagent.core.models import FunctionAnalysis, Parameter, FrameworkInfo
+from devagent.core.models import FunctionAnalysis, FunctionBatch, Parameter, FrameworkInfo
+from .ast_cache import get_default_ast_cache
+
+
+_HAS_UNPARSE: Final[bool] = hasattr(ast, 'unparse')
+
+_BUILTINS: Final[FrozenSet[str]] = frozenset(dir(builtins))
+
+# Top-level packages treated as part of the project
+_LOCAL_PREFIXES: Final[FrozenSet[str]] = frozenset(('src', 'app', 'lib'))
+
+# Where a requirement's project name ends: version specifier, marker, extras, URL or comment
+_REQUIREMENT_END_RE = re.compile(r'[<>=!~;\[@\s#]')
+
+@functools.lru_cache(maxsize=256)
+def _load_source(file_path: str, mtime_ns: int, size: int) -> Tuple[bytes, ast.Module]:
+    """Read and parse a source file; the stat fields key the cache"""
+    return get_default_ast_cache().load(file_path)
+
+
+@dataclass
+class _FileAnalysis:
+    """Everything the analyzer reports about one file, in ast.walk order"""
+    functions: List[FunctionAnalysis]
+    classes: List[Dict[str, Any]]
+    imports: List[str]
+
+
+class _CollectingVisitor(ast.NodeVisitor):
+    """Collect functions, classes, imports, complexity and dependencies in one descent
+    
+    Complexity and dependencies of a nested function also count towards every
+    enclosing function, matching a separate walk over each function body.
+    Results are recorded with their depth so a stable sort restores the
+    breadth-first order that ast.walk used to produce. Type hints, bases and
+    call targets repeat heavily, so they are interned and cached analyses
+    share one copy of each.
+    """
+    
+    def __init__(self, analyzer: 'PythonASTAnalyzer', file_path: str):
+        self._analyzer = analyzer
+        self._file_path = file_path
+        self._builtins: FrozenSet[str] = analyzer.builtin_functions
+        self._track_name_loads: bool = analyzer.track_name_loads
+        self._depth: int = 0
+        self._complexity_stack: List[int] = []
+        self._dependency_stack: List[Set[str]] = []
+        self._function_nodes: Dict[ast.FunctionDef, FunctionAnalysis] = {}
+        self._functions: List[Tuple[int, FunctionAnalysis]] = []
+        self._classes: List[Tuple[int, Dict[str, Any]]] = []
+        self._imports: List[Tuple[int, str]] = []
+    
+    def visit(self, node: ast.AST) -> None:
+        self._depth += 1
+        super().visit(node)
+        self._depth -= 1
+    
+    def result(self) -> _FileAnalysis:
+        """Get the collected results in breadth-first order"""
+        by_depth = itemgetter(0)
+        return _FileAnalysis(
+            functions=[item for _, item in sorted(self._functions, key=by_depth)],
+            classes=[item for _, item in sorted(self._classes, key=by_depth)],
+            imports=[item for _, item in sorted(self._imports, key=by_depth)]
+        )
+    
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        depth = self._depth
+        self._complexity_stack.append(1)
+        self._dependency_stack.append(set())
+        
+        self.generic_visit(node)
+        
+        complexity = self._complexity_stack.pop()
+        dependencies = self._dependency_stack.pop()
+        if self._complexity_stack:
+            self._complexity_stack[-1] += complexity - 1
+            self._dependency_stack[-1] |= dependencies
+        
+        analysis = self._analyzer._analyze_function_node(
+            node, self._file_path, complexity, list(dependencies)
+        )
+        self._function_nodes[node] = analysis
+        self._functions.append((depth, analysis))
+    
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        depth = self._depth
+        self.generic_visit(node)
+        
+        self._classes.append((depth, {
+            'name': node.name,
+            'start_line': node.lineno,
+            'end_line': node.end_lineno or node.lineno,
+            'methods': [self._function_nodes[item] for item in node.body
+                        if isinstance(item, ast.FunctionDef)],
+            'docstring': ast.get_docstring(node),
+            'bases': [sys.intern(self._analyzer._get_name(base)) for base in node.bases]
+        }))
+    
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self._imports.append((self._depth, alias.name))
+    
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.module:
+            self._imports.append((self._depth, node.module))
+    
+    def visit_Call(self, node: ast.Call) -> None:
+        if self._dependency_stack:
+            func = node.func
+            if isinstance(func, ast.Name):
+                # Direct function call
+                if func.id not in self._builtins:
+                    self._dependency_stack[-1].add(func.id)
+            elif isinstance(func, ast.Attribute):
+                # Method call or module function
+                self._dependency_stack[-1].add(sys.intern(self._analyzer._get_name(func)))
+        
+        self.generic_visit(node)
+    
+    def visit_Name(self, node: ast.Name) -> None:
+        # Variable usage, only when asked for since it dwarfs the call targets
+        if not self._track_name_loads or not self._dependency_stack:
+            return
+        if isinstance(node.ctx, ast.Load) and node.id not in self._builtins:
+            self._dependency_stack[-1].add(node.id)
+    
+    def _visit_decision(self, node: ast.AST) -> None:
+        if self._complexity_stack:
+            self._complexity_stack[-1] += 1
+        self.generic_visit(node)
+    
+    # Nodes that add a branch to a function's cyclomatic complexity
+    visit_If = visit_While = visit_For = visit_AsyncFor = _visit_decision
+    visit_ExceptHandler = visit_BoolOp = visit_comprehension = _visit_decision
 
 
 class PythonASTAnalyzer(CodeAnalyzer):
     """Python code analyzer using AST"""
     
-    def __init__(self):
-        self.builtin_functions = set(dir(__builtins__))
+    __slots__ = (
+        'builtin_functions', 'track_name_loads', 'precise_defaults',
+        '_analysis_cache', '_cache_lock'
+    )
+    
+    ANALYSIS_CACHE_SIZE = 256
+    
+    def __init__(self, track_name_loads: bool = False, precise_defaults: bool = False):
+        self.builtin_functions = _BUILTINS
+        self.track_name_loads = track_name_loads
+        self.precise_defaults = precise_defaults
+        
+        # file path -> (mtime_ns, size, _FileAnalysis), in LRU order
+        self._analysis_cache: 'OrderedDict[str, Tuple[int, int, _FileAnalysis]]' = OrderedDict()
+        self._cache_lock = threading.Lock()
     
     def analyze_function(self, file_path: str, function_name: str) -> FunctionAnalysis:
         """Analyze a specific function in detail"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        tree = ast.parse(content)
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef) and node.name == function_name:
-                return self._analyze_function_node(node, file_path, content)
+        for func_info in self._analyze_file(file_path).functions:
+            if func_info.name == function_name:
+                return self._copy_function(func_info)
         
         raise ValueError(f"Function '{function_name}' not found in {file_path}")
     
     def extract_functions(self, file_path: str) -> List[Dict[str, Any]]:
         """Extract all functions from a file"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        tree = ast.parse(content)
-        functions = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                func_info = self._analyze_function_node(node, file_path, content)
-                functions.append({
-                    'name': func_info.name,
-                    'start_line': func_info.start_line,
-                    'end_line': func_info.end_line,
-                    'parameters': func_info.parameters,
-                    'return_type': func_info.return_type,
-                    'docstring': func_info.docstring,
-                    'complexity': func_info.complexity_score
-                })
-        
-        return functions
+        return [
+            {
+                'name': func_info.name,
+                'start_line': func_info.start_line,
+                'end_line': func_info.end_line,
+                'parameters': self._copy_function(func_info).parameters,
+                'return_type': func_info.return_type,
+                'docstring': func_info.docstring,
+                'complexity': func_info.complexity_score
+            }
+            for func_info in self._analyze_file(file_path).functions
+        ]
+    
+    def extract_function_batch(self, file_path: str) -> FunctionBatch:
+        """Extract all functions from a file as columns"""
+        batch = FunctionBatch()
+        for func_info in self._analyze_file(file_path).functions:
+            batch.append(self._copy_function(func_info))
+        
+        return batch
     
     def extract_classes(self, file_path: str) -> List[Dict[str, Any]]:
         """Extract all classes from a file"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        tree = ast.parse(content)
         classes = []
         
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                class_info = {
-                    'name': node.name,
-                    'start_line': node.lineno,
-                    'end_line': node.end_lineno or node.lineno,
-                    'methods': [],
-                    'docstring': ast.get_docstring(node),
-                    'bases': [self._get_name(base) for base in node.bases]
-                }
-                
-                # Extract methods
-                for item in node.body:
-                    if isinstance(item, ast.FunctionDef):
-                        method_info = self._analyze_function_node(item, file_path, content)
-                        class_info['methods'].append({
-                            'name': method_info.name,
-                            'parameters': method_info.parameters,
-                            'return_type': method_info.return_type,
-                            'docstring': method_info.docstring
-                        })
-                
-                classes.append(class_info)
+        for class_info in self._analyze_file(file_path).classes:
+            classes.append({
+                **class_info,
+                'methods': [
+                    {
+                        'name': method_info.name,
+                        'parameters': self._copy_function(method_info).parameters,
+                        'return_type': method_info.return_type,
+                        'docstring': method_info.docstring
+                    }
+                    for method_info in class_info['methods']
+                ],
+                'bases': list(class_info['bases'])
+            })
         
         return classes
     
     def get_imports(self, file_path: str) -> Dict[str, List[str]]:
         """Extract all imports from a file"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        tree = ast.parse(content)
         imports = {
             'standard': [],
             'third_party': [],
             'local': []
         }
         
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    module_name = alias.name
-                    imports[self._classify_import(module_name)].append(module_name)
-            
-            elif isinstance(node, ast.ImportFrom):
-                if node.module:
-                    module_name = node.module
-                    imports[self._classify_import(module_name)].append(module_name)
+        for module_name in self._analyze_file(file_path).imports:
+            imports[self._classify_import(module_name)].append(module_name)
         
         return imports
     
     def calculate_complexity(self, file_path: str) -> Dict[str, int]:
         """Calculate cyclomatic complexity for functions"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        tree = ast.parse(content)
-        complexities = {}
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                complexity = self._calculate_cyclomatic_complexity(node)
-                complexities[node.name] = complexity
-        
-        return complexities
+        return {
+            func_info.name: func_info.complexity_score
+            for func_info in self._analyze_file(file_path).functions
+        }
+    
+    def _load(self, file_path: str) -> Tuple[bytes, ast.Module]:
+        """Get the raw source bytes and parsed tree of a file
+        
+        Parses are shared across calls until the file's mtime or size changes,
+        so callers must treat the returned tree as read-only.
+        """
+        stat = os.stat(file_path)
+        return _load_source(file_path, stat.st_mtime_ns, stat.st_size)
     
-    def _analyze_function_node(self, node: ast.FunctionDef, file_path: str, content: str) -> FunctionAnalysis:
-        """Analyze a function AST node"""
+    def _analyze_file(self, file_path: str) -> _FileAnalysis:
+        """Analyze a whole file in one pass, reusing the result while it is unchanged"""
+        stat = os.stat(file_path)
+        
+        with self._cache_lock:
+            entry = self._analysis_cache.get(file_path)
+            if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+                self._analysis_cache.move_to_end(file_path)
+                return entry[2]
+        
+        _, tree = self._load(file_path)
+        visitor = _CollectingVisitor(self, file_path)
+        visitor.visit(tree)
+        analysis = visitor.result()
+        
+        with self._cache_lock:
+            self._analysis_cache[file_path] = (stat.st_mtime_ns, stat.st_size, analysis)
+            self._analysis_cache.move_to_end(file_path)
+            while len(self._analysis_cache) > self.ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
+        
+        return analysis
+    
+    def _copy_function(self, func_info: FunctionAnalysis) -> FunctionAnalysis:
+        """Copy a cached analysis so callers can modify it freely"""
+        return replace(
+            func_info,
+            parameters=[replace(param) for param in func_info.parameters],
+            dependencies=list(func_info.dependencies)
+        )
+    
+    def _analyze_function_node(self, node: ast.FunctionDef, file_path: str,
+                               complexity: int, dependencies: List[str]) -> FunctionAnalysis:
+        """Build the analysis of a function AST node from its collected metrics"""
         # Extract parameters
         parameters = []
         for arg in node.args.args:
             param = Parameter(
                 name=arg.arg,
-                type_hint=self._get_type_annotation(arg.annotation) if arg.annotation else None,
+                type_hint=sys.intern(self._get_type_annotation(arg.annotation)) if arg.annotation else None,
                 is_required=True
             )
             parameters.append(param)
@@ -150,17 +310,11 @@ class PythonASTAnalyzer(CodeAnalyzer):
         # Extract return type
         return_type = None
         if node.returns:
-            return_type = self._get_type_annotation(node.returns)
+            return_type = sys.intern(self._get_type_annotation(node.returns))
         
         # Get docstring
         docstring = ast.get_docstring(node)
         
-        # Calculate complexity
-        complexity = self._calculate_cyclomatic_complexity(node)
-        
-        # Find dependencies
-        dependencies = self._find_function_dependencies(node)
-        
         return FunctionAnalysis(
             name=node.name,
             parameters=parameters,
@@ -183,19 +337,31 @@ class PythonASTAnalyzer(CodeAnalyzer):
             return f"{self._get_name(annotation.value)}.{annotation.attr}"
         elif isinstance(annotation, ast.Subscript):
             value = self._get_name(annotation.value)
-            slice_val = self._get_name(annotation.slice)
+            if isinstance(annotation.slice, ast.Tuple) and annotation.slice.elts:
+                slice_val = ', '.join(map(_source, annotation.slice.elts))
+                if len(annotation.slice.elts) == 1:
+                    slice_val += ','
+            else:
+                slice_val = self._get_name(annotation.slice)
             return f"{value}[{slice_val}]"
         else:
-            return ast.unparse(annotation) if hasattr(ast, 'unparse') else str(annotation)
+            return _source(annotation)
     
     def _get_default_value(self, default) -> str:
-        """Extract default value as string"""
+        """Extract default value as string
+        
+        Uncommon expressions give a placeholder naming the node type unless
+        the analyzer was created with precise_defaults.
+        """
         if isinstance(default, ast.Constant):
             return repr(default.value)
         elif isinstance(default, ast.Name):
             return default.id
-        else:
-            return ast.unparse(default) if hasattr(ast, 'unparse') else str(default)
+        elif self.precise_defaults:
+            return _source(default)
+        
+        source = _simple_source(default)
+        return source if source is not None else f"<{type(default).__name__}>"
     
     def _get_name(self, node) -> str:
         """Get name from various AST node types"""
@@ -206,69 +372,174 @@ class PythonASTAnalyzer(CodeAnalyzer):
         elif isinstance(node, ast.Constant):
             return str(node.value)
         else:
-            return ast.unparse(node) if hasattr(ast, 'unparse') else str(node)
-    
-    def _calculate_cyclomatic_complexity(self, node: ast.FunctionDef) -> int:
-        """Calculate cyclomatic complexity of a function"""
-        complexity = 1  # Base complexity
-        
-        for child in ast.walk(node):
-            if isinstance(child, (ast.If, ast.While, ast.For, ast.AsyncFor)):
-                complexity += 1
-            elif isinstance(child, ast.ExceptHandler):
-                complexity += 1
-            elif isinstance(child, (ast.And, ast.Or)):
-                complexity += 1
-            elif isinstance(child, ast.comprehension):
-                complexity += 1
-        
-        return complexity
-    
-    def _find_function_dependencies(self, node: ast.FunctionDef) -> List[str]:
-        """Find functions and modules that this function depends on"""
-        dependencies = set()
-        
-        for child in ast.walk(node):
-            if isinstance(child, ast.Call):
-                if isinstance(child.func, ast.Name):
-                    # Direct function call
-                    func_name = child.func.id
-                    if func_name not in self.builtin_functions:
-                        dependencies.add(func_name)
-                elif isinstance(child.func, ast.Attribute):
-                    # Method call or module function
-                    full_name = self._get_name(child.func)
-                    dependencies.add(full_name)
-            
-            elif isinstance(child, ast.Name) and isinstance(child.ctx, ast.Load):
-                # Variable usage
-                if child.id not in self.builtin_functions:
-                    dependencies.add(child.id)
-        
-        return list(dependencies)
+            return _source(node)
     
     def _classify_import(self, module_name: str) -> str:
         """Classify import as standard, third-party, or local"""
-        import sys
-        
-        # Check if it's a standard library module
-        if module_name in sys.stdlib_module_names:
-            return 'standard'
-        
-        # Check if it starts with a dot (relative import)
-        if module_name.startswith('.'):
-            return 'local'
-        
-        # Simple heuristic: if it contains no dots or starts with common patterns
-        if '.' not in module_name or module_name.split('.')[0] in ['src', 'app', 'lib']:
-            return 'local'
-        
-        return 'third_party'
+        return _classify_module(module_name)
+
+
+def _source(node: ast.AST) -> str:
+    """Get the source of an expression, unparsing only what has no cheap rendering"""
+    source = _simple_source(node)
+    if source is None:
+        source = ast.unparse(node) if _HAS_UNPARSE else str(node)
+    return source
+
+
+def _simple_source(node: ast.AST) -> Optional[str]:
+    """Render the common annotation and default shapes exactly as ast.unparse would
+    
+    Covers names, dotted names, subscripts, simple literals, X | Y unions and
+    argument-less calls; anything else gives None.
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    
+    if isinstance(node, ast.Attribute):
+        if isinstance(node.value, (ast.Name, ast.Attribute)):
+            value = _simple_source(node.value)
+            if value is not None:
+                return f"{value}.{node.attr}"
+        return None
+    
+    if isinstance(node, ast.Constant):
+        value = node.value
+        if value is Ellipsis:
+            return '...'
+        if value is None or isinstance(value, bool) or type(value) is int:
+            return repr(value)
+        if type(value) is float and math.isfinite(value):
+            return repr(value)
+        if type(value) is str and value.isidentifier() and node.kind is None:
+            return repr(value)
+        return None
+    
+    if isinstance(node, ast.Subscript):
+        if not isinstance(node.value, (ast.Name, ast.Attribute, ast.Subscript)):
+            return None
+        value = _simple_source(node.value)
+        if isinstance(node.slice, ast.Tuple) and node.slice.elts:
+            parts = _simple_sources(node.slice.elts)
+            inner = None if parts is None else ', '.join(parts) + (',' if len(parts) == 1 else '')
+        else:
+            inner = _simple_source(node.slice)
+        if value is None or inner is None:
+            return None
+        return f"{value}[{inner}]"
+    
+    if isinstance(node, (ast.Tuple, ast.List)):
+        parts = _simple_sources(node.elts)
+        if parts is None:
+            return None
+        if isinstance(node, ast.List):
+            return f"[{', '.join(parts)}]"
+        return f"({', '.join(parts)}{',' if len(parts) == 1 else ''})"
+    
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr) and not isinstance(node.right, ast.BinOp):
+        left = _simple_source(node.left)
+        right = _simple_source(node.right)
+        if left is None or right is None:
+            return None
+        return f"{left} | {right}"
+    
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub) and isinstance(node.operand, ast.Constant):
+        operand = node.operand.value
+        if type(operand) is int or (type(operand) is float and math.isfinite(operand)):
+            return f"-{operand!r}"
+        return None
+    
+    if isinstance(node, ast.Call) and not node.args and not node.keywords:
+        if isinstance(node.func, (ast.Name, ast.Attribute)):
+            func = _simple_source(node.func)
+            if func is not None:
+                return f"{func}()"
+        return None
+    
+    if isinstance(node, ast.Dict) and not node.keys:
+        return '{}'
+    
+    return None
+
+
+def _simple_sources(nodes: List[ast.expr]) -> Optional[List[str]]:
+    """Render several expressions with _simple_source, or None if any has no rendering"""
+    parts = []
+    for node in nodes:
+        source = _simple_source(node)
+        if source is None:
+            return None
+        parts.append(source)
+    return parts
+
+
+@functools.lru_cache(maxsize=4096)
+def _classify_module(module_name: str) -> str:
+    """Classify a module name as standard, third-party, or local"""
+    package, dot, _ = module_name.partition('.')
+    
+    # Check if it's a standard library module; the set lists top-level packages only
+    if package in sys.stdlib_module_names:
+        return 'standard'
+    
+    # Check if it starts with a dot (relative import)
+    if not package:
+        return 'local'
+    
+    # Simple heuristic: if it contains no dots or starts with common patterns
+    if not dot or package in _LOCAL_PREFIXES:
+        return 'local'
+    
+    return 'third_party'
+
+
+def _index_indicators(frameworks: Dict[str, List[str]]) -> Dict[str, str]:
+    """Map each lower-cased framework indicator to the framework it belongs to"""
+    index: Dict[str, str] = {}
+    for framework, indicators in frameworks.items():
+        for indicator in indicators:
+            index.setdefault(indicator.lower(), framework)
+    
+    return index
+
+
+def _project_entries(project_dir: Path) -> FrozenSet[str]:
+    """List the entry names in a project directory with a single scandir"""
+    try:
+        with os.scandir(project_dir) as entries:
+            return frozenset(entry.name for entry in entries)
+    except OSError:
+        return frozenset()
+
+
+def _requirement_name(line: str) -> Optional[str]:
+    """Get the lower-cased project name from a requirement line
+    
+    Blank lines, comments and pip options such as -r or -e give None.
+    """
+    line = line.strip()
+    if not line or line.startswith(('#', '-')):
+        return None
+    
+    return _REQUIREMENT_END_RE.split(line, 1)[0].lower() or None
+
+
+def _read_requirement_names(path: Path) -> List[str]:
+    """Read the project names listed in a requirements file, or nothing if it does not exist"""
+    try:
+        lines = path.read_text().splitlines()
+    except (FileNotFoundError, NotADirectoryError):
+        # e.g. requirements/test.txt when 'requirements' is a plain file
+        return []
+    
+    return [name for name in map(_requirement_name, lines) if name]
 
 
 class PythonFrameworkDetector:
     """Detect Python frameworks and testing libraries"""
     
+    __slots__ = ()
+    
     TESTING_FRAMEWORKS = {
         'pytest': ['pytest', 'pytest-cov', 'pytest-mock'],
         'unittest': ['unittest'],
@@ -284,21 +555,25 @@ class PythonFrameworkDetector:
         'pyramid': ['pyramid']
     }
     
+    _TESTING_INDEX = _index_indicators(TESTING_FRAMEWORKS)
+    _WEB_INDEX = _index_indicators(WEB_FRAMEWORKS)
+    
     def detect_testing_framework(self, project_path: str) -> FrameworkInfo:
         """Detect the testing framework used in the project"""
         project_dir = Path(project_path)
+        entries = _project_entries(project_dir)
         
         # Check for configuration files
         config_files = []
-        if (project_dir / 'pytest.ini').exists():
+        if 'pytest.ini' in entries:
             config_files.append('pytest.ini')
             return FrameworkInfo('pytest', config_files=config_files)
         
-        if (project_dir / 'pyproject.toml').exists():
+        if 'pyproject.toml' in entries:
             config_files.append('pyproject.toml')
             # Could contain pytest config
             
-        if (project_dir / 'setup.cfg').exists():
+        if 'setup.cfg' in entries:
             config_files.append('setup.cfg')
         
         # Check requirements files
@@ -307,16 +582,11 @@ class PythonFrameworkDetector:
             'test-requirements.txt', 'requirements/test.txt'
         ]
         
-        dependencies = []
-        for req_file in requirements_files:
-            req_path = project_dir / req_file
-            if req_path.exists():
-                with open(req_path, 'r') as f:
-                    dependencies.extend(f.read().splitlines())
+        dependencies = self._read_requirements(project_dir, requirements_files, entries)
         
         # Check setup.py
         setup_py = project_dir / 'setup.py'
-        if setup_py.exists():
+        if 'setup.py' in entries:
             try:
                 with open(setup_py, 'r') as f:
                     content = f.read()
@@ -325,14 +595,15 @@ class PythonFrameworkDetector:
                 pass
         
         # Determine framework based on dependencies
-        for framework, indicators in self.TESTING_FRAMEWORKS.items():
-            for indicator in indicators:
-                if any(indicator in dep for dep in dependencies):
-                    return FrameworkInfo(
-                        framework, 
-                        config_files=config_files,
-                        dependencies=dependencies
-                    )
+        framework = self._match_framework(
+            self._TESTING_INDEX, self.TESTING_FRAMEWORKS, dependencies
+        )
+        if framework:
+            return FrameworkInfo(
+                framework, 
+                config_files=config_files,
+                dependencies=dependencies
+            )
         
         # Default to unittest if no specific framework detected
         return FrameworkInfo('unittest', config_files=config_files)
@@ -340,58 +611,99 @@ class PythonFrameworkDetector:
     def detect_web_framework(self, project_path: str) -> Optional[FrameworkInfo]:
         """Detect web framework used in the project"""
         project_dir = Path(project_path)
+        entries = _project_entries(project_dir)
         
         # Check for Django
-        if (project_dir / 'manage.py').exists():
+        if 'manage.py' in entries:
             return FrameworkInfo('django', config_files=['manage.py'])
         
         # Check requirements and imports
-        dependencies = self._get_project_dependencies(project_dir)
+        dependencies = self._get_project_dependencies(project_dir, entries)
         
-        for framework, indicators in self.WEB_FRAMEWORKS.items():
-            for indicator in indicators:
-                if any(indicator in dep for dep in dependencies):
-                    return FrameworkInfo(framework, dependencies=dependencies)
+        framework = self._match_framework(
+            self._WEB_INDEX, self.WEB_FRAMEWORKS, dependencies
+        )
+        if framework:
+            return FrameworkInfo(framework, dependencies=dependencies)
         
         return None
     
+    def _match_framework(self, index: Dict[str, str], frameworks: Dict[str, List[str]],
+                         dependencies: List[str]) -> Optional[str]:
+        """Find the first framework, in priority order, that any dependency belongs to
+        
+        Each dependency name is looked up as is and by its leading segment, so
+        plugins such as pytest-asyncio or flask-cors count for their framework.
+        """
+        found = set()
+        for dependency in dependencies:
+            framework = index.get(dependency)
+            if framework is None:
+                framework = index.get(dependency.replace('_', '-').partition('-')[0])
+            if framework is not None:
+                found.add(framework)
+        
+        return next((framework for framework in frameworks if framework in found), None)
+    
     def _extract_dependencies_from_setup(self, content: str) -> List[str]:
         """Extract dependencies from setup.py content"""
         dependencies = []
         try:
-            tree = ast.parse(content)
-            for node in ast.walk(tree):
+            # Breadth-first like ast.walk, without its generator overhead
+            queue: Deque[ast.AST] = deque([ast.parse(content)])
+            popleft, extend, iter_child_nodes = queue.popleft, queue.extend, ast.iter_child_nodes
+            while queue:
+                node = popleft()
+                extend(iter_child_nodes(node))
                 if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
                     if node.func.id == 'setup':
                         for keyword in node.keywords:
                             if keyword.arg in ['install_requires', 'tests_require', 'extras_require']:
                                 if isinstance(keyword.value, ast.List):
                                     for item in keyword.value.elts:
-                                        if isinstance(item, ast.Constant):
-                                            dependencies.append(item.value)
+                                        if isinstance(item, ast.Constant) and isinstance(item.value, str):
+                                            name = _requirement_name(item.value)
+                                            if name:
+                                                dependencies.append(name)
         except Exception:
             pass
         
         return dependencies
     
-    def _get_project_dependencies(self, project_dir: Path) -> List[str]:
-        """Get all project dependencies from various sources"""
+    def _read_requirements(self, project_dir: Path, names: List[str], entries: FrozenSet[str],
+                           ignore_errors: bool = False) -> List[str]:
+        """Read the project names in several requirements files concurrently, in order
+        
+        Names whose first path component is not among the directory's entries
+        are skipped without touching the disk. File reads release the GIL, so
+        a small thread pool overlaps the rest.
+        """
+        names = [name for name in names if name.partition('/')[0] in entries]
+        if not names:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=len(names)) as pool:
+            futures = [pool.submit(_read_requirement_names, project_dir / name) for name in names]
+        
         dependencies = []
+        for future in futures:
+            try:
+                dependencies.extend(future.result())
+            except Exception:
+                if not ignore_errors:
+                    raise
         
+        return dependencies
+    
+    def _get_project_dependencies(self, project_dir: Path, entries: FrozenSet[str]) -> List[str]:
+        """Get all project dependencies from various sources"""
         # Check requirements files
         req_files = ['requirements.txt', 'requirements-dev.txt', 'dev-requirements.txt']
-        for req_file in req_files:
-            req_path = project_dir / req_file
-            if req_path.exists():
-                try:
-                    with open(req_path, 'r') as f:
-                        dependencies.extend(f.read().splitlines())
-                except Exception:
-                    pass
+        dependencies = self._read_requirements(project_dir, req_files, entries, ignore_errors=True)
         
         # Check setup.py
         setup_py = project_dir / 'setup.py'
-        if setup_py.exists():
+        if 'setup.py' in entries:
             try:
                 with open(setup_py, 'r') as f:
                     content = f.read()
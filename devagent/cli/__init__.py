@@ -1,5 +1,12 @@
 """CLI interface components"""
 
-from .main import app
+__all__ = ['app']
 
-__all__ = ['app']
\ No newline at end of file
+
+def __getattr__(name):
+    # Import the Typer app on first access so `python -m devagent.cli.main`
+    # reaches its --version fast path before the CLI is built
+    if name == 'app':
+        from .main import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
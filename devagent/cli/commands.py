@@ -1,16 +1,15 @@
 """CLI command implementations"""
 
-from typing import Optional
-from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.panel import Panel
-from rich.table import Table
-from rich.text import Text
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
 
 from devagent.core.config import ConfigManager
 from devagent.core.validation import InputValidator, ConfigValidator, ValidationError
-
-console = Console()
+from devagent.core.models import FunctionBatch
+from devagent.core.paths import iter_source_files
+from devagent.analysis.python_analyzer import PythonASTAnalyzer
+from devagent.cli.console import get_console, create_progress
 
 
 class BaseCommand:
@@ -24,9 +23,16 @@ class BaseCommand:
 class GenerateTestsCommand(BaseCommand):
     """Test generation command implementation"""
     
+    EXCLUDED_DIRS = frozenset({'node_modules', '__pycache__'})
+    PYTHON_EXTENSIONS = frozenset({'.py'})
+    # Smaller directories are analyzed in-process; worker start-up would dominate
+    PARALLEL_ANALYSIS_MIN_FILES = 32
+    ANALYSIS_CHUNKSIZE = 16
+    
     def execute(self, file: Optional[str], function: Optional[str], 
                 directory: Optional[str], coverage: int, framework: Optional[str]):
         """Execute test generation command"""
+        from rich.panel import Panel
         
         # Validate inputs
         if not any([file, directory]):
@@ -44,27 +50,23 @@ class GenerateTestsCommand(BaseCommand):
             dir_path = InputValidator.validate_directory_path(directory)
         
         # Show what would be done
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
+        with create_progress() as progress:
             task = progress.add_task("Analyzing code structure...", total=None)
             
             if file:
                 if function:
                     progress.update(task, description=f"Analyzing function '{function}' in {file}...")
-                    console.print(f"[green]✓[/green] Would generate tests for function '{function}' in {file}")
+                    get_console().print(f"[green]✓[/green] Would generate tests for function '{function}' in {file}")
                 else:
                     progress.update(task, description=f"Analyzing all functions in {file}...")
-                    console.print(f"[green]✓[/green] Would generate tests for all functions in {file}")
+                    get_console().print(f"[green]✓[/green] Would generate tests for all functions in {file}")
             else:
                 progress.update(task, description=f"Analyzing directory {directory}...")
-                console.print(f"[green]✓[/green] Would generate tests for all files in {directory}")
-            
-            progress.update(task, description="Test generation complete!")
+                file_count, functions = self._analyze_directory(dir_path)
+                get_console().print(f"[green]✓[/green] Would generate tests for {len(functions)} functions "
+                                    f"across {file_count} files in {directory}")
         
-        console.print(Panel.fit(
+        get_console().print(Panel.fit(
             f"[green]Test generation completed![/green]\n\n"
             f"Target coverage: {coverage}%\n"
             f"Framework: {framework or 'auto-detected'}\n"
@@ -72,6 +74,31 @@ class GenerateTestsCommand(BaseCommand):
             title="Test Generation Results",
             border_style="green"
         ))
+    
+    def _analyze_directory(self, dir_path) -> Tuple[int, FunctionBatch]:
+        """Analyze every Python file under a directory into one batch of functions
+        
+        Parsing is CPU-bound, so larger directories are spread over a process
+        pool rather than threads. Returns the number of files and their
+        functions.
+        """
+        files = list(iter_source_files(str(dir_path), self.PYTHON_EXTENSIONS, self._exclude_dir))
+        
+        functions = FunctionBatch()
+        if len(files) < self.PARALLEL_ANALYSIS_MIN_FILES:
+            for file_path in files:
+                functions.extend(_analyze_file(file_path))
+            return len(files), functions
+        
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+            for batch in pool.map(_analyze_file, files, chunksize=self.ANALYSIS_CHUNKSIZE):
+                functions.extend(batch)
+        
+        return len(files), functions
+    
+    def _exclude_dir(self, name: str) -> bool:
+        """Check whether a directory is hidden or excluded from analysis"""
+        return name.startswith('.') or name in self.EXCLUDED_DIRS
 
 
 class DocsCommand(BaseCommand):
@@ -79,6 +106,7 @@ class DocsCommand(BaseCommand):
     
     def execute(self, target: str, format: str, output: Optional[str], include_examples: bool):
         """Execute documentation generation command"""
+        from rich.panel import Panel
         
         # Validate inputs
         format = InputValidator.validate_output_format(format)
@@ -92,23 +120,17 @@ class DocsCommand(BaseCommand):
             target_type = "symbol"
             target_path = target
         
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
+        with create_progress() as progress:
             task = progress.add_task("Analyzing code structure...", total=None)
             
             if target_type == "file":
                 progress.update(task, description=f"Analyzing file {target}...")
-                console.print(f"[green]✓[/green] Would generate {format} documentation for {target}")
+                get_console().print(f"[green]✓[/green] Would generate {format} documentation for {target}")
             else:
                 progress.update(task, description=f"Searching for symbol '{target}'...")
-                console.print(f"[green]✓[/green] Would generate {format} documentation for symbol '{target}'")
-            
-            progress.update(task, description="Documentation generation complete!")
+                get_console().print(f"[green]✓[/green] Would generate {format} documentation for symbol '{target}'")
         
-        console.print(Panel.fit(
+        get_console().print(Panel.fit(
             f"[green]Documentation generated![/green]\n\n"
             f"Format: {format}\n"
             f"Include examples: {'Yes' if include_examples else 'No'}\n"
@@ -125,6 +147,7 @@ class RefactorCommand(BaseCommand):
     def execute(self, file: str, refactor_type: str, function: Optional[str], 
                 preview: bool, backup: bool):
         """Execute refactoring command"""
+        from rich.panel import Panel
         
         # Validate inputs
         file_path = InputValidator.validate_file_path(file)
@@ -133,28 +156,22 @@ class RefactorCommand(BaseCommand):
         if function:
             function_name = InputValidator.validate_function_name(function)
         
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
+        with create_progress() as progress:
             task = progress.add_task("Analyzing code for refactoring...", total=None)
             
             if backup and not preview:
                 progress.update(task, description="Creating backup...")
-                console.print(f"[green]✓[/green] Would create backup of {file}")
+                get_console().print(f"[green]✓[/green] Would create backup of {file}")
             
             if function:
                 progress.update(task, description=f"Refactoring function '{function}'...")
-                console.print(f"[green]✓[/green] Would apply '{refactor_type}' to function '{function}' in {file}")
+                get_console().print(f"[green]✓[/green] Would apply '{refactor_type}' to function '{function}' in {file}")
             else:
                 progress.update(task, description=f"Refactoring entire file...")
-                console.print(f"[green]✓[/green] Would apply '{refactor_type}' to entire file {file}")
-            
-            progress.update(task, description="Refactoring analysis complete!")
+                get_console().print(f"[green]✓[/green] Would apply '{refactor_type}' to entire file {file}")
         
         if preview:
-            console.print(Panel.fit(
+            get_console().print(Panel.fit(
                 f"[yellow]Preview Mode - No changes applied[/yellow]\n\n"
                 f"Refactoring type: {refactor_type}\n"
                 f"Target: {function or 'entire file'}\n"
@@ -163,7 +180,7 @@ class RefactorCommand(BaseCommand):
                 border_style="yellow"
             ))
         else:
-            console.print(Panel.fit(
+            get_console().print(Panel.fit(
                 f"[green]Refactoring completed![/green]\n\n"
                 f"Type: {refactor_type}\n"
                 f"Target: {function or 'entire file'}\n"
@@ -193,25 +210,27 @@ class ConfigCommand(BaseCommand):
         if llm:
             llm = ConfigValidator.validate_llm_provider(llm)
             self.config.llm.provider = llm
-            console.print(f"[green]✓[/green] LLM provider set to: {llm}")
+            get_console().print(f"[green]✓[/green] LLM provider set to: {llm}")
         
         if model:
             model = ConfigValidator.validate_model_name(model)
             self.config.llm.model = model
-            console.print(f"[green]✓[/green] Model set to: {model}")
+            get_console().print(f"[green]✓[/green] Model set to: {model}")
         
         if api_key:
             api_key = ConfigValidator.validate_api_key_env(api_key)
             self.config.llm.api_key_env = api_key
-            console.print(f"[green]✓[/green] API key environment variable set to: {api_key}")
+            get_console().print(f"[green]✓[/green] API key environment variable set to: {api_key}")
         
         # Save configuration if any changes were made
         if any([llm, model, api_key]):
             self.config.save_to_file()
-            console.print("\n[green]Configuration saved successfully![/green]")
+            get_console().print("\n[green]Configuration saved successfully![/green]")
     
     def _show_config(self):
         """Display current configuration"""
+        from rich.table import Table
+        
         table = Table(title="DevAgent Configuration")
         table.add_column("Setting", style="cyan", no_wrap=True)
         table.add_column("Value", style="green")
@@ -228,6 +247,8 @@ class ConfigCommand(BaseCommand):
         table.add_row("Auto Update", str(self.config.indexing.auto_update))
         table.add_row("Chunk Size", str(self.config.indexing.chunk_size))
         table.add_row("Supported Extensions", ", ".join(self.config.indexing.supported_extensions))
+        table.add_row("Embedding Backend", self.config.indexing.embedding_backend)
+        table.add_row("Vector Backend", self.config.indexing.vector_backend)
         
         # Generation Configuration
         table.add_section()
@@ -235,16 +256,17 @@ class ConfigCommand(BaseCommand):
         table.add_row("Follow Style Guide", str(self.config.generation.follow_style_guide))
         table.add_row("Max Test Coverage", f"{self.config.generation.max_test_coverage}%")
         
-        console.print(table)
+        get_console().print(table)
     
     def _reset_config(self):
         """Reset configuration to defaults"""
+        from rich.panel import Panel
         from devagent.core.config import DevAgentConfig
         
         default_config = DevAgentConfig.default()
         default_config.save_to_file()
         
-        console.print(Panel.fit(
+        get_console().print(Panel.fit(
             "[green]Configuration reset to defaults![/green]\n\n"
             "Default settings:\n"
             "• LLM Provider: openai\n"
@@ -252,4 +274,13 @@ class ConfigCommand(BaseCommand):
             "• All other settings restored to defaults",
             title="Configuration Reset",
             border_style="green"
-        ))
\ No newline at end of file
+        ))
+
+
+def _analyze_file(file_path: str) -> FunctionBatch:
+    """Analyze the functions of one file; module-level so process pool workers can run it"""
+    try:
+        return PythonASTAnalyzer().extract_function_batch(file_path)
+    except (OSError, SyntaxError, UnicodeDecodeError, ValueError) as e:
+        print(f"Warning: Could not analyze {file_path}: {e}")
+        return FunctionBatch()
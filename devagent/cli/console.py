@@ -0,0 +1,40 @@
+"""Shared Rich output for CLI commands"""
+
+import functools
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.progress import Progress
+
+
+@functools.lru_cache(maxsize=None)
+def get_console() -> 'Console':
+    """Get the shared console, importing Rich on first use
+    
+    Rich is only loaded once a command prints, which keeps it out of the
+    start-up path and out of process pool workers.
+    """
+    from rich.console import Console
+    
+    return Console()
+
+
+def create_progress(output: Optional['Console'] = None) -> 'Progress':
+    """Create the spinner shown while a command works
+    
+    Redraws are throttled and the spinner is cleared once the command is
+    done, so a final status update is never seen. Off a terminal the spinner
+    is disabled entirely and scripted runs pay nothing for it.
+    """
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    
+    output = output or get_console()
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=output,
+        refresh_per_second=4,
+        transient=True,
+        disable=not output.is_terminal,
+    )
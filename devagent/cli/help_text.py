@@ -0,0 +1,50 @@
+"""Full help text for CLI commands, imported only when help is shown"""
+
+COMMAND_HELP = {
+    "init": """Initialize DevAgent in a project directory.
+
+This will:
+• Create configuration directory
+• Index the codebase for context
+• Set up default configuration""",
+    "test": """Generate comprehensive unit tests for functions or files.
+
+Examples:
+• devagent test --file=src/utils.py --function=calculate_metrics
+• devagent test --file=src/utils.py
+• devagent test --directory=src/core""",
+    "docs": """Generate comprehensive documentation for code elements.
+
+Examples:
+• devagent docs --target=src/api.py --format=markdown
+• devagent docs --target=UserManager --output=docs/
+• devagent docs --target=src/utils.py --format=rst""",
+    "refactor": """Perform intelligent code refactoring while preserving functionality.
+
+Refactoring types:
+• extract-method: Extract code into separate methods
+• rename-variable: Rename variables consistently
+• optimize: Optimize code performance
+• modernize: Update to modern language features
+
+Examples:
+• devagent refactor --file=legacy.py --type=modernize
+• devagent refactor --file=utils.py --type=extract-method --function=complex_method""",
+    "config": """Configure DevAgent settings.
+
+Examples:
+• devagent config --llm=openai --api-key=OPENAI_API_KEY
+• devagent config --llm=ollama --model=llama3.1:8b
+• devagent config --show""",
+    "generate": """Generate code using custom prompts with codebase context.
+
+Examples:
+• devagent generate --prompt="Create a FastAPI endpoint for user management"
+• devagent generate --prompt="Add error handling to this function" --context=src/utils.py""",
+    "index": "Index the codebase to build context for the agents.",
+    "analyze": """Analyze code quality and provide insights.
+
+Examples:
+• devagent analyze src/ --complexity --coverage
+• devagent analyze utils.py --suggestions""",
+}
@@ -1,18 +1,23 @@
 """Main CLI application entry point"""
 
+import sys
+
+if __name__ == "__main__" and sys.argv[1:2] in (["-v"], ["--version"]):
+    # Answer --version before Typer, Rich and the configuration are loaded
+    from devagent import __version__
+    print(f"DevAgent version: {__version__}")
+    sys.exit(0)
+
+import os
+import functools
 import typer
-from typing import Optional
-from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.panel import Panel
-from rich.text import Text
+from typing import Optional, NoReturn, TYPE_CHECKING
 
-from devagent.core.config import ConfigManager
-from devagent.core.validation import InputValidator, ValidationError
-from devagent.cli.commands import ConfigCommand
+from devagent.core.error_handling import ValidationError
+from devagent.cli.console import get_console
 
-# Initialize console for rich output
-console = Console()
+if TYPE_CHECKING:
+    from devagent.core.interfaces import TaskResult
 
 # Create the main Typer app
 app = typer.Typer(
@@ -22,15 +27,60 @@ app = typer.Typer(
     rich_markup_mode="rich"
 )
 
-# Initialize config manager
-config_manager = ConfigManager()
+
+@functools.lru_cache(maxsize=None)
+def _get_config_manager():
+    """Get the shared config manager, loading the configuration on first use"""
+    from devagent.core.config import ConfigManager
+    
+    return ConfigManager()
+
+
+def _exit_with_error(message: str) -> NoReturn:
+    """Print an error message and exit with status 1"""
+    get_console().print(message)
+    raise typer.Exit(1)
+
+
+def _run_task(command: str, target_file: Optional[str] = None, target_function: Optional[str] = None,
+              **parameters) -> 'TaskResult':
+    """Run a task through the orchestrator, exiting with status 1 unless it succeeds"""
+    try:
+        from devagent.agent.orchestrator import AgentOrchestrator
+        from devagent.core.interfaces import Task
+        
+        orchestrator = AgentOrchestrator(_get_config_manager())
+        result = orchestrator.execute_task(Task(
+            command=command,
+            target_file=target_file,
+            target_function=target_function,
+            parameters=parameters,
+            context_requirements=[]
+        ))
+    except ValidationError as e:
+        _exit_with_error(f"[red]Error: {e}[/red]")
+    except Exception as e:
+        _exit_with_error(f"[red]Unexpected error: {e}[/red]")
+    
+    if not result.success:
+        _exit_with_error(f"[red]ERROR:[/red] {result.output_message}")
+    return result
+
+
+def _report(result: 'TaskResult') -> None:
+    """Print a successful task's message and the files it touched"""
+    get_console().print(f"[green]SUCCESS:[/green] {result.output_message}")
+    if result.generated_files:
+        get_console().print(f"Generated files: {', '.join(result.generated_files)}")
+    if result.modified_files:
+        get_console().print(f"Modified files: {', '.join(result.modified_files)}")
 
 
 def version_callback(value: bool):
     """Show version information"""
     if value:
         from devagent import __version__
-        console.print(f"DevAgent version: {__version__}")
+        get_console().print(f"DevAgent version: {__version__}")
         raise typer.Exit()
 
 
@@ -52,73 +102,61 @@ def main(
     pass
 
 
-@app.command()
 def init(
     project_path: str = typer.Argument(".", help="Project directory to initialize"),
-    force: bool = typer.Option(False, "--force", "-f", help="Force initialization even if already initialized")
+    force: bool = typer.Option(False, "--force", "-f", help="Force initialization even if already initialized"),
+    verbose: bool = typer.Option(False, "--verbose", help="Show each initialization step")
 ):
-    """
-    Initialize DevAgent in a project directory.
+    """Initialize DevAgent in a project directory."""
+    from devagent.core.validation import InputValidator
+    
+    def step(description: str) -> None:
+        if verbose:
+            get_console().print(description)
     
-    This will:
-    • Create configuration directory
-    • Index the codebase for context
-    • Set up default configuration
-    """
     try:
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            task = progress.add_task("Initializing DevAgent...", total=None)
-            
-            # Validate project path
-            project_dir = InputValidator.validate_project_path(project_path)
-            progress.update(task, description="Validating project structure...")
-            
-            # Check if already initialized
-            devagent_dir = project_dir / ".devagent"
-            if devagent_dir.exists() and not force:
-                console.print("[yellow]DevAgent already initialized in this project.[/yellow]")
-                console.print("Use --force to reinitialize.")
-                raise typer.Exit(1)
-            
-            # Create .devagent directory
-            progress.update(task, description="Creating configuration directory...")
-            devagent_dir.mkdir(exist_ok=True)
-            
-            # Create default config
-            progress.update(task, description="Setting up configuration...")
-            config_path = devagent_dir / "config.yaml"
-            config = config_manager.config
-            config.save_to_file(str(config_path))
-            
-            # Create index directory
-            progress.update(task, description="Preparing index directory...")
-            (devagent_dir / "index").mkdir(exist_ok=True)
-            
-            progress.update(task, description="Initialization complete!")
+        # Validate project path
+        step("Validating project structure...")
+        project_dir = InputValidator.validate_project_path(project_path)
+    except ValidationError as e:
+        _exit_with_error(f"[red]Error: {e}[/red]")
+    
+    # Check if already initialized
+    devagent_dir = project_dir / ".devagent"
+    if devagent_dir.exists() and not force:
+        get_console().print("[yellow]DevAgent already initialized in this project.[/yellow]")
+        _exit_with_error("Use --force to reinitialize.")
+    
+    try:
+        # Create .devagent directory
+        step("Creating configuration directory...")
+        devagent_dir.mkdir(exist_ok=True)
         
-        console.print(Panel.fit(
-            "[green]SUCCESS: DevAgent initialized successfully![/green]\n\n"
-            "Next steps:\n"
-            "• Configure your LLM provider: [cyan]devagent config --llm=openai[/cyan]\n"
-            "• Generate tests: [cyan]devagent test --file=src/utils.py[/cyan]\n"
-            "• Create docs: [cyan]devagent docs --file=src/api.py[/cyan]",
-            title="Initialization Complete",
-            border_style="green"
-        ))
+        # Create default config
+        step("Setting up configuration...")
+        config_path = devagent_dir / "config.yaml"
+        config = _get_config_manager().config
+        config.save_to_file(str(config_path))
         
-    except ValidationError as e:
-        console.print(f"[red]Error: {e}[/red]")
-        raise typer.Exit(1)
+        # Create index directory
+        step("Preparing index directory...")
+        (devagent_dir / "index").mkdir(exist_ok=True)
     except Exception as e:
-        console.print(f"[red]Unexpected error: {e}[/red]")
-        raise typer.Exit(1)
+        _exit_with_error(f"[red]Unexpected error: {e}[/red]")
+    
+    from rich.panel import Panel
+    
+    get_console().print(Panel.fit(
+        "[green]SUCCESS: DevAgent initialized successfully![/green]\n\n"
+        "Next steps:\n"
+        "• Configure your LLM provider: [cyan]devagent config --llm=openai[/cyan]\n"
+        "• Generate tests: [cyan]devagent test --file=src/utils.py[/cyan]\n"
+        "• Create docs: [cyan]devagent docs --file=src/api.py[/cyan]",
+        title="Initialization Complete",
+        border_style="green"
+    ))
 
 
-@app.command()
 def test(
     file: Optional[str] = typer.Option(None, "--file", "-f", help="Target file path"),
     function: Optional[str] = typer.Option(None, "--function", help="Specific function name"),
@@ -126,121 +164,49 @@ def test(
     coverage: int = typer.Option(80, "--coverage", help="Target test coverage percentage"),
     framework: Optional[str] = typer.Option(None, "--framework", help="Testing framework to use")
 ):
-    """
-    Generate comprehensive unit tests for functions or files.
-    
-    Examples:
-    • devagent test --file=src/utils.py --function=calculate_metrics
-    • devagent test --file=src/utils.py
-    • devagent test --directory=src/core
-    """
-    try:
-        from devagent.agent.orchestrator import AgentOrchestrator
-        from devagent.core.interfaces import Task
-        
-        orchestrator = AgentOrchestrator(config_manager)
-        
-        task = Task(
-            command="test",
-            target_file=file,
-            target_function=function,
-            parameters={
-                'directory': directory,
-                'coverage': coverage,
-                'framework': framework
-            },
-            context_requirements=[]
-        )
-        
-        result = orchestrator.execute_task(task)
-        
-        if result.success:
-            console.print(f"[green]SUCCESS:[/green] {result.output_message}")
-            if result.generated_files:
-                console.print(f"Generated files: {', '.join(result.generated_files)}")
-        else:
-            console.print(f"[red]ERROR:[/red] {result.output_message}")
-            raise typer.Exit(1)
-    except ValidationError as e:
-        console.print(f"[red]Error: {e}[/red]")
-        raise typer.Exit(1)
-    except Exception as e:
-        console.print(f"[red]Unexpected error: {e}[/red]")
-        raise typer.Exit(1)
+    """Generate comprehensive unit tests for functions or files."""
+    _report(_run_task(
+        "test", file, function,
+        directory=directory, coverage=coverage, framework=framework
+    ))
 
 
-@app.command()
 def docs(
     target: str = typer.Option(..., "--target", "-t", help="Target file, class, or function"),
     format: str = typer.Option("markdown", "--format", "-f", help="Output format (markdown, rst, docstring)"),
     output: Optional[str] = typer.Option(None, "--output", "-o", help="Output file or directory"),
     include_examples: bool = typer.Option(True, "--examples/--no-examples", help="Include usage examples")
 ):
-    """
-    Generate comprehensive documentation for code elements.
-    
-    Examples:
-    • devagent docs --target=src/api.py --format=markdown
-    • devagent docs --target=UserManager --output=docs/
-    • devagent docs --target=src/utils.py --format=rst
-    """
-    try:
-        from devagent.agent.orchestrator import AgentOrchestrator
-        from devagent.core.interfaces import Task
-        from devagent.context.context_engine import DevAgentContextEngine
-        from pathlib import Path
-
-        orchestrator = AgentOrchestrator(config_manager)
-        
-        target_file = None
-        target_function = None
-
-        if Path(target).exists() and Path(target).is_file():
-            target_file = target
-        else:
-            # Assume it's a symbol and search for it
-            console.print(f"Searching for symbol '{target}' in the codebase...")
-            context_engine = DevAgentContextEngine(project_path=".")
-            results = context_engine.search_by_text(target, k=1)
-            if results:
-                target_file = results[0].file_path
-                target_function = target
-                console.print(f"Found symbol '{target}' in file: {target_file}")
-            else:
-                console.print(f"[red]Error: Could not find file or symbol '{target}'[/red]")
-                raise typer.Exit(1)
-
-        task = Task(
-            command="docs",
-            target_file=target_file,
-            target_function=target_function,
-            parameters={
-                'target': target,
-                'format': format,
-                'output': output,
-                'include_examples': include_examples
-            },
-            context_requirements=[]
-        )
+    """Generate comprehensive documentation for code elements."""
+    target_file = None
+    target_function = None
+
+    # A single stat answers both "exists" and "is a file"
+    if os.path.isfile(target):
+        target_file = target
+    else:
+        # Assume it's a symbol and search for it
+        get_console().print(f"Searching for symbol '{target}' in the codebase...")
+        try:
+            from devagent.context.context_engine import DevAgentContextEngine
+            
+            results = DevAgentContextEngine(project_path=".").search_by_text(target, k=1)
+        except Exception as e:
+            _exit_with_error(f"[red]Unexpected error: {e}[/red]")
         
-        result = orchestrator.execute_task(task)
+        if not results:
+            _exit_with_error(f"[red]Error: Could not find file or symbol '{target}'[/red]")
         
-        if result.success:
-            console.print(f"[green]SUCCESS:[/green] {result.output_message}")
-            if result.generated_files:
-                console.print(f"Generated files: {', '.join(result.generated_files)}")
-        else:
-            console.print(f"[red]ERROR:[/red] {result.output_message}")
-            raise typer.Exit(1)
-    except ValidationError as e:
-        console.print(f"[red]Error: {e}[/red]")
-        raise typer.Exit(1)
-    except Exception as e:
-        console.print(f"[red]Unexpected error: {e}[/red]")
-        raise typer.Exit(1)
+        target_file = results[0].file_path
+        target_function = target
+        get_console().print(f"Found symbol '{target}' in file: {target_file}")
+
+    _report(_run_task(
+        "docs", target_file, target_function,
+        target=target, format=format, output=output, include_examples=include_examples
+    ))
 
 
-@app.command()
 def refactor(
     file: str = typer.Option(..., "--file", "-f", help="Target file path"),
     type: str = typer.Option(..., "--type", "-t", help="Refactoring type"),
@@ -248,56 +214,13 @@ def refactor(
     preview: bool = typer.Option(False, "--preview", "-p", help="Preview changes without applying"),
     backup: bool = typer.Option(True, "--backup/--no-backup", help="Create backup before refactoring")
 ):
-    """
-    Perform intelligent code refactoring while preserving functionality.
-    
-    Refactoring types:
-    • extract-method: Extract code into separate methods
-    • rename-variable: Rename variables consistently
-    • optimize: Optimize code performance
-    • modernize: Update to modern language features
-    
-    Examples:
-    • devagent refactor --file=legacy.py --type=modernize
-    • devagent refactor --file=utils.py --type=extract-method --function=complex_method
-    """
-    try:
-        from devagent.agent.orchestrator import AgentOrchestrator
-        from devagent.core.interfaces import Task
-        
-        orchestrator = AgentOrchestrator(config_manager)
-        
-        task = Task(
-            command="refactor",
-            target_file=file,
-            target_function=function,
-            parameters={
-                'type': type,
-                'function': function,
-                'preview': preview,
-                'backup': backup
-            },
-            context_requirements=[]
-        )
-        
-        result = orchestrator.execute_task(task)
-        
-        if result.success:
-            console.print(f"[green]SUCCESS:[/green] {result.output_message}")
-            if result.modified_files:
-                console.print(f"Modified files: {', '.join(result.modified_files)}")
-        else:
-            console.print(f"[red]ERROR:[/red] {result.output_message}")
-            raise typer.Exit(1)
-    except ValidationError as e:
-        console.print(f"[red]Error: {e}[/red]")
-        raise typer.Exit(1)
-    except Exception as e:
-        console.print(f"[red]Unexpected error: {e}[/red]")
-        raise typer.Exit(1)
+    """Perform intelligent code refactoring while preserving functionality."""
+    _report(_run_task(
+        "refactor", file, function,
+        type=type, function=function, preview=preview, backup=backup
+    ))
 
 
-@app.command()
 def config(
     llm: Optional[str] = typer.Option(None, "--llm", help="LLM provider (openai, ollama, anthropic)"),
     model: Optional[str] = typer.Option(None, "--model", help="Model name"),
@@ -305,71 +228,29 @@ def config(
     show: bool = typer.Option(False, "--show", help="Show current configuration"),
     reset: bool = typer.Option(False, "--reset", help="Reset to default configuration")
 ):
-    """
-    Configure DevAgent settings.
-    
-    Examples:
-    • devagent config --llm=openai --api-key=OPENAI_API_KEY
-    • devagent config --llm=ollama --model=llama3.1:8b
-    • devagent config --show
-    """
+    """Configure DevAgent settings."""
     try:
-        config_cmd = ConfigCommand(config_manager)
+        from devagent.cli.commands import ConfigCommand
+        
+        config_cmd = ConfigCommand(_get_config_manager())
         config_cmd.execute(llm, model, api_key, show, reset)
     except ValidationError as e:
-        console.print(f"[red]Error: {e}[/red]")
+        get_console().print(f"[red]Error: {e}[/red]")
         raise typer.Exit(1)
     except Exception as e:
-        console.print(f"[red]Unexpected error: {e}[/red]")
+        get_console().print(f"[red]Unexpected error: {e}[/red]")
         raise typer.Exit(1)
 
 
-@app.command()
 def generate(
     prompt: str = typer.Option(..., "--prompt", "-p", help="Custom generation prompt"),
     output: Optional[str] = typer.Option(None, "--output", "-o", help="Output file path"),
     context: Optional[str] = typer.Option(None, "--context", "-c", help="Additional context file")
 ):
-    """
-    Generate code using custom prompts with codebase context.
-    
-    Examples:
-    • devagent generate --prompt="Create a FastAPI endpoint for user management"
-    • devagent generate --prompt="Add error handling to this function" --context=src/utils.py
-    """
-    try:
-        from devagent.agent.orchestrator import AgentOrchestrator
-        from devagent.core.interfaces import Task
-
-        orchestrator = AgentOrchestrator(config_manager)
-
-        task = Task(
-            command="generate",
-            target_file=None,
-            target_function=None,
-            parameters={
-                'prompt': prompt,
-                'output': output,
-                'context': context
-            },
-            context_requirements=[]
-        )
-
-        result = orchestrator.execute_task(task)
-
-        if result.success:
-            console.print(f"[green]SUCCESS:[/green] {result.output_message}")
-            if result.generated_files:
-                console.print(f"Generated files: {', '.join(result.generated_files)}")
-        else:
-            console.print(f"[red]ERROR:[/red] {result.output_message}")
-            raise typer.Exit(1)
-    except Exception as e:
-        console.print(f"[red]Unexpected error: {e}[/red]")
-        raise typer.Exit(1)
+    """Generate code using custom prompts with codebase context."""
+    _report(_run_task("generate", prompt=prompt, output=output, context=context))
 
 
-@app.command()
 def index(
     project_path: str = typer.Argument(".", help="Project directory to index"),
     force: bool = typer.Option(False, "--force", "-f", help="Force re-indexing")
@@ -378,60 +259,70 @@ def index(
     try:
         from devagent.context.context_engine import DevAgentContextEngine
 
-        console.print(f"Indexing codebase at '{project_path}'...")
-        context_engine = DevAgentContextEngine(project_path)
+        get_console().print(f"Indexing codebase at '{project_path}'...")
+        indexing_config = _get_config_manager().config.indexing
+        context_engine = DevAgentContextEngine(
+            project_path,
+            embedding_backend=indexing_config.embedding_backend,
+            vector_backend=indexing_config.vector_backend
+        )
         context_engine.index_codebase(force_reindex=force)
-        console.print("[green]Codebase indexed successfully![/green]")
+        get_console().print("[green]Codebase indexed successfully![/green]")
 
     except Exception as e:
-        console.print(f"[red]Indexing failed: {e}[/red]")
+        get_console().print(f"[red]Indexing failed: {e}[/red]")
         raise typer.Exit(1)
 
 
-@app.command()
 def analyze(
     target: str = typer.Argument(".", help="Target file or directory to analyze"),
     complexity: bool = typer.Option(False, "--complexity", help="Show complexity metrics"),
     coverage: bool = typer.Option(False, "--coverage", help="Show test coverage"),
     suggestions: bool = typer.Option(False, "--suggestions", help="Show improvement suggestions")
 ):
-    """
-    Analyze code quality and provide insights.
-    
-    Examples:
-    • devagent analyze src/ --complexity --coverage
-    • devagent analyze utils.py --suggestions
-    """
-    try:
-        from devagent.agent.orchestrator import AgentOrchestrator
-        from devagent.core.interfaces import Task
+    """Analyze code quality and provide insights."""
+    result = _run_task(
+        "analyze",
+        target=target, complexity=complexity, coverage=coverage, suggestions=suggestions
+    )
+    get_console().print(f"[green]ANALYSIS RESULTS:[/green]\n{result.output_message}")
 
-        orchestrator = AgentOrchestrator(config_manager)
-
-        task = Task(
-            command="analyze",
-            target_file=None,
-            target_function=None,
-            parameters={
-                'target': target,
-                'complexity': complexity,
-                'coverage': coverage,
-                'suggestions': suggestions
-            },
-            context_requirements=[]
-        )
 
-        result = orchestrator.execute_task(task)
+# Commands are registered on demand rather than with decorators
+_COMMANDS = {
+    "init": init,
+    "test": test,
+    "docs": docs,
+    "refactor": refactor,
+    "config": config,
+    "generate": generate,
+    "index": index,
+    "analyze": analyze,
+}
+
+
+def _register_commands(argv) -> None:
+    """Register the command named on the command line, or every command
+    
+    Typer builds a click command from each registered signature on every
+    run, so registering only the invoked command skips that work for the
+    rest. Help output and unknown names need the full set.
+    
+    Full help text lives in help_text.py and is only imported when help can
+    be shown, so it also survives docstrings being stripped by python -OO.
+    """
+    name = argv[1] if len(argv) > 1 else None
+    names = [name] if name in _COMMANDS else list(_COMMANDS)
+    
+    command_help = {}
+    if len(names) > 1 or "--help" in argv:
+        from devagent.cli.help_text import COMMAND_HELP as command_help
+    
+    for command_name in names:
+        app.command(name=command_name, help=command_help.get(command_name))(_COMMANDS[command_name])
 
-        if result.success:
-            console.print(f"[green]ANALYSIS RESULTS:[/green]\n{result.output_message}")
-        else:
-            console.print(f"[red]ERROR:[/red] {result.output_message}")
-            raise typer.Exit(1)
-    except Exception as e:
-        console.print(f"[red]Unexpected error: {e}[/red]")
-        raise typer.Exit(1)
 
+_register_commands(sys.argv if __name__ == "__main__" else ())
 
 if __name__ == "__main__":
     app()
\ No newline at end of file
@@ -3,5 +3,7 @@
 from .context_engine import DevAgentContextEngine
 from .indexer import CodeIndexer
 from .vector_store import VectorStore
+from .faiss_store import FaissVectorStore
+from .embedding_cache import EmbeddingCache
 
-__all__ = ['DevAgentContextEngine', 'CodeIndexer', 'VectorStore']
\ No newline at end of file
+__all__ = ['DevAgentContextEngine', 'CodeIndexer', 'VectorStore', 'FaissVectorStore', 'EmbeddingCache']
@@ -1,34 +1,61 @@
 """Main context engine implementation"""
 
 import os
+import re
 import json
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from sentence_transformers import SentenceTransformer
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from devagent.core.interfaces import ContextEngine, CodeChunk
+from devagent.core.paths import iter_source_files
+from devagent.analysis.analyzer_factory import AnalyzerFactory
 from .indexer import CodeIndexer
 from .vector_store import VectorStore
+from .faiss_store import FaissVectorStore
+
+# Markers of test code, matched case-insensitively in one pass
+_TEST_KEYWORDS_RE = re.compile(r'test_|def test|it\(|describe\(|assert', re.IGNORECASE)
 
 
 class DevAgentContextEngine(ContextEngine):
     """Main context engine for DevAgent"""
     
-    def __init__(self, project_path: str, persist_directory: str = None):
+    QUERY_CACHE_SIZE = 512
+    EXCLUDED_DIRS = frozenset({'node_modules', '__pycache__'})
+    REINDEX_WORKERS = 8
+    ADD_BATCH_SIZE = 256
+    
+    def __init__(self, project_path: str, persist_directory: str = None,
+                 embedding_backend: str = "torch", vector_backend: str = "chroma"):
         self.project_path = Path(project_path)
         
         if persist_directory is None:
             persist_directory = str(self.project_path / ".devagent" / "index")
         
         self.persist_directory = persist_directory
-        self.indexer = CodeIndexer()
-        self.vector_store = VectorStore(persist_directory)
-        self.model = SentenceTransformer("all-MiniLM-L6-v2")
+        self.indexer = CodeIndexer(backend=embedding_backend)
+        
+        # Per-instance so cached embeddings never outlive this engine's model
+        self._encode_query = functools.lru_cache(maxsize=self.QUERY_CACHE_SIZE)(self._encode)
+        
+        self.vector_store = _create_vector_store(vector_backend, persist_directory, self._encode_query)
         
         # File hash tracking for incremental updates
         self.hash_file = Path(persist_directory) / "file_hashes.json"
         self.file_hashes = self._load_file_hashes()
     
+    @property
+    def model(self):
+        """Embedding model shared with the indexer, loaded on first use"""
+        return self.indexer.model
+    
     def index_codebase(self, project_path: str = None, force_reindex: bool = False) -> None:
         """Index the entire codebase"""
         if project_path:
@@ -47,18 +74,34 @@ class DevAgentContextEngine(ContextEngine):
             "*.log", "*.tmp", ".DS_Store", "Thumbs.db"
         ]
         
-        # Index project
-        chunks = self.indexer.index_project(str(self.project_path), exclude_patterns)
+        # Index project, storing chunks in batches as files are indexed so the
+        # whole project is never held in memory. Batches are cut on file
+        # boundaries so each file's chunks are added together.
+        batch = []
+        indexed_files = []
+        total_chunks = 0
         
-        if chunks:
-            print(f"Adding {len(chunks)} chunks to vector store...")
-            self.vector_store.add_chunks(chunks)
+        for file_chunks in self.indexer.iter_file_chunks(str(self.project_path), exclude_patterns):
+            batch.extend(file_chunks)
+            indexed_files.append(file_chunks[0].file_path)
             
-            # Update file hashes
-            for chunk in chunks:
-                file_hash = self.indexer.get_file_hash(chunk.file_path)
-                self.file_hashes[chunk.file_path] = file_hash
+            if len(batch) >= self.ADD_BATCH_SIZE:
+                self.vector_store.add_chunks(batch)
+                total_chunks += len(batch)
+                batch = []
+        
+        if batch:
+            self.vector_store.add_chunks(batch)
+            total_chunks += len(batch)
+        
+        if total_chunks:
+            print(f"Added {total_chunks} chunks to vector store.")
+            
+            # Update file hashes, once per file rather than once per chunk
+            for file_path in indexed_files:
+                self.file_hashes[file_path] = self.indexer.get_file_hash(file_path)
             
+            self.vector_store.flush()
             self._save_file_hashes()
             print("Indexing complete!")
         else:
@@ -75,35 +118,75 @@ class DevAgentContextEngine(ContextEngine):
         
         print(f"Updating index for {len(changed_files)} changed files...")
         
-        for file_path in changed_files:
+        # Load the model up front so worker threads don't race to load it
+        self.indexer.model
+        
+        # Read, chunk and embed in parallel; the vector store is only written
+        # from this thread
+        workers = min(self.REINDEX_WORKERS, len(changed_files))
+        stored_hashes = [self.file_hashes.get(file_path) for file_path in changed_files]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(self._reindex_file, changed_files, stored_hashes))
+        
+        replacements = []
+        for file_path, chunks, file_hash, error in results:
+            if error is not None:
+                print(f"Warning: Failed to update {file_path}: {error}")
+            elif chunks is not None:
+                # A None result means the content is unchanged and the stored chunks are current
+                replacements.append((file_path, chunks, file_hash))
+        
+        # Remove the old chunks of every changed file in one call
+        try:
+            self.vector_store.delete_file_chunks_bulk(file_path for file_path, _, _ in replacements)
+        except Exception as e:
+            print(f"Warning: Failed to remove old chunks: {e}")
+            replacements = []
+        
+        updated = []
+        for file_path, chunks, file_hash in replacements:
             try:
-                # Remove old chunks for this file
-                self.vector_store.delete_file_chunks(file_path)
-                
-                # Re-index the file
-                chunks = self.indexer.index_file(file_path)
                 if chunks:
                     self.vector_store.add_chunks(chunks)
                 
-                # Update hash
-                file_hash = self.indexer.get_file_hash(file_path)
                 self.file_hashes[file_path] = file_hash
-                
-                print(f"Updated: {file_path}")
+                updated.append(f"Updated: {file_path}")
                 
             except Exception as e:
                 print(f"Warning: Failed to update {file_path}: {e}")
         
+        # Report updated files in one write rather than one per file
+        if updated:
+            print("\n".join(updated))
+        
+        self.vector_store.flush()
         self._save_file_hashes()
         print("Index update complete!")
     
+    def _reindex_file(self, file_path: str, stored_hash: Optional[str]
+                      ) -> Tuple[str, Optional[List[CodeChunk]], Optional[str], Optional[Exception]]:
+        """Hash and chunk one file for update_index; safe to run on a worker thread
+        
+        Chunks are None when the file's content matches stored_hash, so
+        unchanged files are never re-embedded.
+        """
+        try:
+            file_hash = self.indexer.get_file_hash(file_path)
+            if file_hash and file_hash == stored_hash:
+                return file_path, None, file_hash, None
+            
+            chunks = self.indexer.index_file(file_path)
+            return file_path, chunks, file_hash, None
+        except Exception as e:
+            return file_path, None, None, e
+    
     def get_relevant_context(self, query: str, k: int = 5, 
                            file_filter: Optional[str] = None,
                            chunk_type_filter: Optional[str] = None) -> List[CodeChunk]:
         """Get relevant code chunks for a query"""
         
-        # Generate query embedding
-        query_embedding = self.model.encode(query, convert_to_tensor=False).tolist()
+        # Generate query embedding; repeated queries reuse the cached one
+        query_embedding = list(self._encode_query(query))
         
         # Search for similar chunks
         chunks = self.vector_store.search_similar(
@@ -115,6 +198,38 @@ class DevAgentContextEngine(ContextEngine):
         
         return chunks
     
+    def get_relevant_context_batch(self, queries: List[str], k: int = 5,
+                                   file_filter: Optional[str] = None,
+                                   chunk_type_filter: Optional[str] = None) -> List[List[CodeChunk]]:
+        """Get relevant code chunks for several queries at once
+        
+        All queries are embedded in a single batched forward pass, which is
+        much faster than encoding them one at a time.
+        """
+        if not queries:
+            return []
+        
+        embeddings = self.model.encode(
+            queries,
+            batch_size=32,
+            convert_to_tensor=False,
+            show_progress_bar=False
+        )
+        
+        return [
+            self.vector_store.search_similar(
+                embedding.tolist(),
+                k=k,
+                file_filter=file_filter,
+                chunk_type_filter=chunk_type_filter
+            )
+            for embedding in embeddings
+        ]
+    
+    def _encode(self, query: str) -> Tuple[float, ...]:
+        """Embed a query; wrapped in a per-instance LRU cache by __init__"""
+        return tuple(self.model.encode(query, convert_to_tensor=False).tolist())
+    
     def get_function_context(self, file_path: str, function_name: str, k: int = 3) -> List[CodeChunk]:
         """Get context for a specific function"""
         
@@ -134,12 +249,14 @@ class DevAgentContextEngine(ContextEngine):
         for chunk in chunks:
             if chunk.metadata.get('name') == function_name:
                 function_chunks.append(chunk)
+                if len(function_chunks) >= k:
+                    # Enough exact matches; related chunks would be cut anyway
+                    return function_chunks[:k]
             else:
                 other_chunks.append(chunk)
         
         # Return function chunks first, then related chunks
-        result = function_chunks + other_chunks[:k-len(function_chunks)]
-        return result[:k]
+        return function_chunks + other_chunks[:k-len(function_chunks)]
     
     def get_file_context(self, file_path: str) -> List[CodeChunk]:
         """Get all chunks for a specific file"""
@@ -161,11 +278,7 @@ class DevAgentContextEngine(ContextEngine):
         chunks = self.get_relevant_context(query, k=10)
         
         # Filter for test-related chunks
-        test_chunks = []
-        for chunk in chunks:
-            content_lower = chunk.content.lower()
-            if any(keyword in content_lower for keyword in ['test_', 'def test', 'it(', 'describe(', 'assert']):
-                test_chunks.append(chunk)
+        test_chunks = [chunk for chunk in chunks if _TEST_KEYWORDS_RE.search(chunk.content)]
         
         return test_chunks[:5]  # Return top 5 test patterns
     
@@ -177,39 +290,44 @@ class DevAgentContextEngine(ContextEngine):
             'project_path': str(self.project_path),
             'total_indexed_files': len(self.file_hashes),
             'vector_store_stats': vector_stats,
-            'model_name': self.model.get_sentence_embedding_dimension()
+            'model_name': self.indexer.model_name
         }
         
         return stats
     
+    def _exclude_dir(self, name: str) -> bool:
+        """Check whether a directory is hidden or excluded from indexing"""
+        return name.startswith('.') or name in self.EXCLUDED_DIRS
+    
     def _find_changed_files(self) -> List[str]:
         """Find files that have changed since last indexing"""
         changed_files = []
         
+        deleted_files = []
+        
         # Check existing indexed files
         for file_path, stored_hash in self.file_hashes.items():
             if os.path.exists(file_path):
                 if self.indexer.should_reindex_file(file_path, stored_hash):
                     changed_files.append(file_path)
             else:
-                # File was deleted, remove from vector store
-                self.vector_store.delete_file_chunks(file_path)
+                deleted_files.append(file_path)
+        
+        # Files that were deleted are removed from the vector store together
+        if deleted_files:
+            self.vector_store.delete_file_chunks_bulk(deleted_files)
+            for file_path in deleted_files:
                 del self.file_hashes[file_path]
         
         # Check for new files
-        from devagent.analysis.analyzer_factory import AnalyzerFactory
-        supported_extensions = AnalyzerFactory.get_supported_extensions()
+        supported_extensions = frozenset(AnalyzerFactory.get_supported_extensions())
         
-        for root, dirs, files in os.walk(self.project_path):
-            # Skip excluded directories
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__']]
-            
-            for file in files:
-                file_path = str(Path(root) / file)
-                
-                if Path(file_path).suffix in supported_extensions:
-                    if file_path not in self.file_hashes:
-                        changed_files.append(file_path)
+        # Compare normalized paths so './a.py' and 'a.py' count as the same file
+        indexed = {os.path.normpath(file_path) for file_path in self.file_hashes}
+        
+        for file_path in iter_source_files(str(self.project_path), supported_extensions, self._exclude_dir):
+            if os.path.normpath(file_path) not in indexed:
+                changed_files.append(file_path)
         
         return changed_files
     
@@ -217,8 +335,8 @@ class DevAgentContextEngine(ContextEngine):
         """Load file hashes from disk"""
         if self.hash_file.exists():
             try:
-                with open(self.hash_file, 'r') as f:
-                    return json.load(f)
+                raw = self.hash_file.read_bytes()
+                return orjson.loads(raw) if orjson is not None else json.loads(raw)
             except Exception as e:
                 print(f"Warning: Could not load file hashes: {e}")
         
@@ -228,7 +346,25 @@ class DevAgentContextEngine(ContextEngine):
         """Save file hashes to disk"""
         try:
             self.hash_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.hash_file, 'w') as f:
-                json.dump(self.file_hashes, f, indent=2)
+            if orjson is not None:
+                data = orjson.dumps(self.file_hashes, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(self.file_hashes, indent=2).encode('utf-8')
+            
+            # Write to a temporary file first so a crash never leaves a partial file
+            tmp_path = self.hash_file.with_suffix('.json.tmp')
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, self.hash_file)
         except Exception as e:
-            print(f"Warning: Could not save file hashes: {e}")
\ No newline at end of file
+            print(f"Warning: Could not save file hashes: {e}")
+
+
+def _create_vector_store(backend: str, persist_directory: str, embedding_function):
+    """Create the vector store for a backend name, falling back to ChromaDB"""
+    if backend == "faiss":
+        try:
+            return FaissVectorStore(persist_directory, embedding_function=embedding_function)
+        except ImportError as e:
+            print(f"Warning: Could not use faiss vector store, using chroma: {e}")
+    
+    return VectorStore(persist_directory)
@@ -0,0 +1,180 @@
+"""Persistent cache of chunk embeddings"""
+
+import os
+import sqlite3
+import hashlib
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class EmbeddingCache:
+    """SQLite store of embeddings keyed by a hash of the model and chunk text
+    
+    An unchanged chunk is never sent through the model twice, whichever file
+    or project it came from. By default vectors are quantized to int8 with a
+    per-vector float32 scale, a quarter of the size of raw float32 bytes;
+    pass quantize=False to store them exactly. They are read back as float32
+    numpy arrays when numpy is installed.
+    """
+    
+    # Stay well under SQLite's limit on parameters per statement
+    QUERY_BATCH_SIZE = 500
+    
+    def __init__(self, cache_path: Optional[str] = None, quantize: bool = True):
+        if cache_path is None:
+            cache_path = os.path.expanduser("~/.devagent/embedding_cache.sqlite3")
+        
+        self.cache_path = Path(cache_path)
+        self.quantize = quantize
+        # Each storage format has its own table, so switching never misreads entries
+        self._table = "embeddings_int8" if quantize else "embeddings"
+        self._connection = None
+        self._disabled = False
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(model_id: str, text: str) -> bytes:
+        """Build the cache key for a text embedded by a given model"""
+        digest = hashlib.blake2b(model_id.encode('utf-8'), digest_size=16)
+        digest.update(b'\0')
+        digest.update(text.encode('utf-8', 'surrogatepass'))
+        return digest.digest()
+    
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, Sequence[float]]:
+        """Get the cached embeddings for the keys that have one"""
+        found = {}
+        unpack = _unpack_int8 if self.quantize else _unpack
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return found
+            
+            try:
+                for i in range(0, len(keys), self.QUERY_BATCH_SIZE):
+                    batch = keys[i:i + self.QUERY_BATCH_SIZE]
+                    placeholders = ','.join('?' * len(batch))
+                    rows = connection.execute(
+                        f"SELECT key, vector FROM {self._table} WHERE key IN ({placeholders})", batch
+                    )
+                    for key, vector in rows:
+                        found[key] = unpack(vector)
+            except sqlite3.Error as e:
+                print(f"Warning: Could not read embedding cache: {e}")
+        
+        return found
+    
+    def put_many(self, items: Iterable[Tuple[bytes, Sequence[float]]]) -> None:
+        """Store embeddings in a single transaction"""
+        pack = _pack_int8 if self.quantize else _pack
+        rows = [(key, pack(embedding)) for key, embedding in items
+                if embedding is not None and len(embedding)]
+        if not rows:
+            return
+        
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return
+            
+            try:
+                with connection:
+                    connection.executemany(
+                        f"INSERT OR REPLACE INTO {self._table} (key, vector) VALUES (?, ?)", rows
+                    )
+            except sqlite3.Error as e:
+                print(f"Warning: Could not write embedding cache: {e}")
+    
+    def clear(self) -> None:
+        """Remove all cached embeddings"""
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return
+            
+            try:
+                with connection:
+                    connection.execute(f"DELETE FROM {self._table}")
+            except sqlite3.Error as e:
+                print(f"Warning: Could not clear embedding cache: {e}")
+    
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the database on first use; the cache is disabled if that fails"""
+        if self._connection is not None or self._disabled:
+            return self._connection
+        
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.cache_path), check_same_thread=False)
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self._table} (key BLOB PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            connection.commit()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: Embedding cache unavailable: {e}")
+            self._disabled = True
+            return None
+        
+        self._connection = connection
+        return connection
+
+
+def _pack(embedding: Sequence[float]) -> bytes:
+    """Encode an embedding as float32 bytes"""
+    if np is not None:
+        return np.asarray(embedding, dtype=np.float32).tobytes()
+    return array('f', embedding).tobytes()
+
+
+def _unpack(data: bytes) -> Sequence[float]:
+    """Decode float32 bytes into an embedding, without copying when numpy is installed"""
+    if np is not None:
+        return np.frombuffer(data, dtype=np.float32)
+    
+    vector = array('f')
+    vector.frombytes(data)
+    return vector.tolist()
+
+
+def _pack_int8(embedding: Sequence[float]) -> bytes:
+    """Encode an embedding as a float32 scale followed by int8 components
+    
+    The scale maps the largest magnitude component to 127, so each component
+    is off by at most half a step after decoding.
+    """
+    if np is not None:
+        vector = np.asarray(embedding, dtype=np.float32)
+        scale = float(np.abs(vector).max()) / 127 or 1.0
+        quantized = np.round(vector / scale).astype(np.int8)
+        return array('f', [scale]).tobytes() + quantized.tobytes()
+    
+    scale = max(abs(value) for value in embedding) / 127 or 1.0
+    return array('f', [scale]).tobytes() + array('b', [round(value / scale) for value in embedding]).tobytes()
+
+
+def _unpack_int8(data: bytes) -> Sequence[float]:
+    """Decode a scale and int8 components into a float32 embedding"""
+    scale = array('f', data[:4])[0]
+    if np is not None:
+        return np.frombuffer(data, dtype=np.int8, offset=4).astype(np.float32) * np.float32(scale)
+    
+    return [value * scale for value in array('b', data[4:])]
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_embedding_cache() -> EmbeddingCache:
+    """Get the process-wide embedding cache"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = EmbeddingCache()
+        return _default_cache
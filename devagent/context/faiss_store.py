@@ -0,0 +1,280 @@
+"""Vector storage using FAISS"""
+
+import os
+import json
+from dataclasses import replace
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable, Callable, Sequence
+
+try:
+    import faiss
+    import numpy as np
+except ImportError:
+    faiss = None
+    np = None
+
+from devagent.core.interfaces import CodeChunk
+
+
+class FaissVectorStore:
+    """In-process vector storage and retrieval using FAISS
+    
+    A drop-in alternative to VectorStore for large code corpora. Embeddings
+    are kept as one L2-normalized float32 matrix next to a list of chunks, and
+    searched by inner product, i.e. cosine similarity. Below IVF_THRESHOLD
+    chunks the search is an exact flat scan; above it an IVF+PQ index is
+    trained. The index is rebuilt on the first search after a change, and
+    changes are written to disk by flush().
+    """
+    
+    IVF_THRESHOLD = 50000
+    IVF_NLIST = 256
+    IVF_NPROBE = 16
+    PQ_SUBQUANTIZERS = 48
+    PQ_BITS = 8
+    # Candidates fetched per wanted result when filters are applied after the search
+    FILTER_OVERSAMPLE = 4
+    
+    EMBEDDINGS_FILE = "faiss_embeddings.npy"
+    CHUNKS_FILE = "faiss_chunks.json"
+    
+    def __init__(self, persist_directory: str = ".devagent/index",
+                 embedding_function: Optional[Callable[[str], Sequence[float]]] = None):
+        if faiss is None:
+            raise ImportError("FaissVectorStore requires the faiss-cpu and numpy packages")
+        
+        self.persist_directory = persist_directory
+        self.embedding_function = embedding_function
+        
+        # Ensure directory exists
+        Path(persist_directory).mkdir(parents=True, exist_ok=True)
+        self._embeddings_path = Path(persist_directory) / self.EMBEDDINGS_FILE
+        self._chunks_path = Path(persist_directory) / self.CHUNKS_FILE
+        
+        # Row i of the embedding matrix belongs to self._chunks[i]; added rows
+        # are kept as separate blocks until the matrix is next needed
+        self._chunks: List[CodeChunk] = []
+        self._blocks: List[Any] = []
+        self._index = None
+        self._dirty = False
+        
+        self._load()
+    
+    def add_chunks(self, chunks: List[CodeChunk]) -> None:
+        """Add code chunks to vector store"""
+        rows = []
+        stored = []
+        for chunk in chunks:
+            if chunk.embedding is None or len(chunk.embedding) == 0:
+                continue
+            
+            rows.append(chunk.embedding)
+            stored.append(replace(chunk, embedding=None))
+        
+        if not rows:
+            return
+        
+        block = np.array(rows, dtype=np.float32)
+        faiss.normalize_L2(block)
+        
+        self._blocks.append(block)
+        self._chunks.extend(stored)
+        self._index = None
+        self._dirty = True
+    
+    def search_similar(self, query_embedding: Sequence[float], k: int = 5,
+                       file_filter: Optional[str] = None,
+                       chunk_type_filter: Optional[str] = None) -> List[CodeChunk]:
+        """Search for similar code chunks
+        
+        Filters are applied to an oversampled candidate list, which is grown
+        until k chunks match or every chunk has been considered.
+        """
+        index = self._get_index()
+        if index is None or k <= 0:
+            return []
+        
+        query = np.array([query_embedding], dtype=np.float32)
+        faiss.normalize_L2(query)
+        
+        filtered = bool(file_filter or chunk_type_filter)
+        total = index.ntotal
+        fetch = min(k * self.FILTER_OVERSAMPLE if filtered else k, total)
+        
+        while True:
+            _, rows = index.search(query, fetch)
+            matches = [
+                self._chunks[row] for row in rows[0]
+                if row >= 0 and _matches(self._chunks[row], file_filter, chunk_type_filter)
+            ]
+            if len(matches) >= k or fetch >= total:
+                break
+            fetch = min(fetch * 2, total)
+        
+        return [replace(chunk) for chunk in matches[:k]]
+    
+    def search_by_text(self, query_text: str, k: int = 5,
+                       file_filter: Optional[str] = None,
+                       chunk_type_filter: Optional[str] = None) -> List[CodeChunk]:
+        """Search using text query, embedded with the store's embedding function"""
+        if self.embedding_function is None:
+            raise ValueError("FaissVectorStore needs an embedding_function to search by text")
+        
+        return self.search_similar(self.embedding_function(query_text), k, file_filter, chunk_type_filter)
+    
+    def delete_file_chunks(self, file_path: str) -> None:
+        """Delete all chunks for a specific file"""
+        self.delete_file_chunks_bulk([file_path])
+    
+    def delete_file_chunks_bulk(self, file_paths: Iterable[str]) -> None:
+        """Delete all chunks for several files in a single pass over the store"""
+        file_paths = set(file_paths)
+        if not file_paths:
+            return
+        
+        keep = [i for i, chunk in enumerate(self._chunks) if chunk.file_path not in file_paths]
+        if len(keep) == len(self._chunks):
+            return
+        
+        matrix = self._matrix()
+        self._blocks = [matrix[keep]] if keep else []
+        self._chunks = [self._chunks[i] for i in keep]
+        self._index = None
+        self._dirty = True
+    
+    def get_file_chunks(self, file_path: str) -> List[CodeChunk]:
+        """Get all chunks for a specific file"""
+        return [replace(chunk) for chunk in self._chunks if chunk.file_path == file_path]
+    
+    def count_chunks(self) -> int:
+        """Get total number of chunks in store"""
+        return len(self._chunks)
+    
+    def list_files(self) -> List[str]:
+        """List all files that have chunks in the store"""
+        return list({chunk.file_path for chunk in self._chunks})
+    
+    def clear(self) -> None:
+        """Clear all chunks from store"""
+        self._chunks = []
+        self._blocks = []
+        self._index = None
+        self._dirty = True
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get statistics about the vector store"""
+        stats = {
+            'total_chunks': len(self._chunks),
+            'total_files': len(self.list_files()),
+            'chunk_types': {},
+            'files': {}
+        }
+        
+        for chunk in self._chunks:
+            stats['chunk_types'][chunk.chunk_type] = stats['chunk_types'].get(chunk.chunk_type, 0) + 1
+            stats['files'][chunk.file_path] = stats['files'].get(chunk.file_path, 0) + 1
+        
+        return stats
+    
+    def flush(self) -> None:
+        """Write the embeddings and chunks to disk if they have changed"""
+        if not self._dirty:
+            return
+        
+        records = [
+            {
+                'content': chunk.content,
+                'file_path': chunk.file_path,
+                'start_line': chunk.start_line,
+                'end_line': chunk.end_line,
+                'chunk_type': chunk.chunk_type,
+                'metadata': chunk.metadata
+            }
+            for chunk in self._chunks
+        ]
+        
+        try:
+            matrix = self._matrix()
+            embeddings_tmp = self._embeddings_path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(embeddings_tmp, 'wb') as f:
+                np.save(f, matrix if matrix is not None else np.zeros((0, 0), dtype=np.float32))
+            
+            chunks_tmp = self._chunks_path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(chunks_tmp, 'w', encoding='utf-8') as f:
+                json.dump(records, f, default=str)
+            
+            os.replace(embeddings_tmp, self._embeddings_path)
+            os.replace(chunks_tmp, self._chunks_path)
+            self._dirty = False
+        except OSError as e:
+            print(f"Warning: Could not save faiss vector store: {e}")
+    
+    def close(self):
+        """Close the vector store, saving any pending changes"""
+        self.flush()
+        self._index = None
+    
+    def __enter__(self):
+        """Context manager entry"""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        self.close()
+    
+    def _load(self) -> None:
+        """Load a previously flushed store"""
+        if not self._embeddings_path.exists() or not self._chunks_path.exists():
+            return
+        
+        try:
+            matrix = np.load(self._embeddings_path)
+            with open(self._chunks_path, 'r', encoding='utf-8') as f:
+                records = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load faiss vector store: {e}")
+            return
+        
+        if len(records) != len(matrix):
+            print("Warning: Faiss vector store files are out of sync, starting empty")
+            return
+        
+        self._chunks = [CodeChunk(**record) for record in records]
+        self._blocks = [matrix] if len(matrix) else []
+    
+    def _matrix(self):
+        """Get all embeddings as one matrix, merging blocks added since the last call"""
+        if len(self._blocks) > 1:
+            self._blocks = [np.concatenate(self._blocks)]
+        return self._blocks[0] if self._blocks else None
+    
+    def _get_index(self):
+        """Get the search index, building it if the store changed"""
+        if self._index is None:
+            matrix = self._matrix()
+            if matrix is not None:
+                self._index = self._build_index(matrix)
+        return self._index
+    
+    def _build_index(self, matrix):
+        """Build an exact index for small stores and an IVF+PQ index for large ones"""
+        dim = matrix.shape[1]
+        if len(matrix) < self.IVF_THRESHOLD or dim % self.PQ_SUBQUANTIZERS:
+            index = faiss.IndexFlatIP(dim)
+        else:
+            quantizer = faiss.IndexFlatIP(dim)
+            index = faiss.IndexIVFPQ(
+                quantizer, dim, self.IVF_NLIST, self.PQ_SUBQUANTIZERS, self.PQ_BITS,
+                faiss.METRIC_INNER_PRODUCT
+            )
+            index.train(matrix)
+            index.nprobe = self.IVF_NPROBE
+        
+        index.add(matrix)
+        return index
+
+
+def _matches(chunk: CodeChunk, file_filter: Optional[str], chunk_type_filter: Optional[str]) -> bool:
+    """Check a chunk against optional file and chunk type filters"""
+    return ((not file_filter or chunk.file_path == file_filter)
+            and (not chunk_type_filter or chunk.chunk_type == chunk_type_filter))
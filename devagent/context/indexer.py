@@ -1,46 +1,133 @@
 """Code indexing for context retrieval"""
 
 import os
+import re
+import fnmatch
+import bisect
 import hashlib
+import functools
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Set
-from sentence_transformers import SentenceTransformer
+from typing import List, Dict, Any, Optional, Set, Iterator, Pattern, Tuple, Sequence
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
 
 from devagent.core.interfaces import CodeChunk
+from devagent.core.paths import iter_source_files
 from devagent.analysis.analyzer_factory import AnalyzerFactory
+from .embedding_cache import EmbeddingCache, get_default_embedding_cache
 
 
 class CodeIndexer:
     """Indexes code files for context retrieval"""
     
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
-        self.model = SentenceTransformer(model_name)
+    HASH_BLOCK_SIZE = 1 << 20
+    EMBEDDING_BATCH_SIZE = 64
+    DEFAULT_EXCLUDE_PATTERNS = ("*.pyc", "__pycache__", ".git", "node_modules", ".venv", "venv")
+    # Smaller projects are chunked in-process; worker start-up would dominate
+    PARALLEL_CHUNKING_MIN_FILES = 32
+    CHUNKING_CHUNKSIZE = 8
+    # Chunks gathered from consecutive files before they are embedded together
+    EMBEDDING_GROUP_SIZE = 256
+    
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", backend: str = "torch",
+                 embedding_cache: Optional[EmbeddingCache] = None):
+        self.model_name = model_name
+        self.backend = backend
+        self.embedding_cache = embedding_cache or get_default_embedding_cache()
+        self._model = None
+        self._model_id = None
         self.chunk_size = 1000
         self.overlap = 100
     
+    @property
+    def model(self):
+        """Embedding model, loaded on first use"""
+        if self._model is None:
+            self._model, self._model_id = _load_embedding_model(self.model_name, self.backend)
+        return self._model
+    
+    @property
+    def model_id(self) -> str:
+        """Identifier of the vectors the loaded model produces, for embedding cache keys"""
+        if self._model_id is None:
+            self.model
+        return self._model_id
+    
     def index_project(self, project_path: str, exclude_patterns: List[str] = None) -> List[CodeChunk]:
         """Index entire project directory"""
+        code_chunks = []
+        for file_chunks in self.iter_file_chunks(project_path, exclude_patterns):
+            code_chunks.extend(file_chunks)
+        
+        return code_chunks
+    
+    def iter_file_chunks(self, project_path: str, exclude_patterns: List[str] = None) -> Iterator[List[CodeChunk]]:
+        """Index a project one file at a time, yielding each file's chunks
+        
+        Lets callers store chunks as they are produced instead of holding the
+        whole project in memory. Files without chunks are skipped. Reading
+        and chunking is CPU-bound, so larger projects spread it over a process
+        pool; the chunks of consecutive files are then embedded together in
+        this process, in one batch per EMBEDDING_GROUP_SIZE chunks.
+        """
         if exclude_patterns is None:
-            exclude_patterns = ["*.pyc", "__pycache__", ".git", "node_modules", ".venv", "venv"]
+            exclude_patterns = self.DEFAULT_EXCLUDE_PATTERNS
         
         project_dir = Path(project_path)
-        code_chunks = []
         
         # Find all supported code files
         supported_extensions = AnalyzerFactory.get_supported_extensions()
         
-        for file_path in self._find_code_files(project_dir, supported_extensions, exclude_patterns):
-            try:
-                file_chunks = self.index_file(str(file_path))
-                code_chunks.extend(file_chunks)
-            except Exception as e:
-                print(f"Warning: Failed to index {file_path}: {e}")
+        file_paths = self._find_code_files(project_dir, supported_extensions, exclude_patterns)
+        
+        group = []
+        group_size = 0
+        for file_path, file_chunks, error in self._chunk_files(file_paths):
+            if error is not None:
+                print(f"Warning: Failed to index {file_path}: {error}")
                 continue
+            
+            if file_chunks:
+                group.append(file_chunks)
+                group_size += len(file_chunks)
+            
+            if group_size >= self.EMBEDDING_GROUP_SIZE:
+                self._embed_chunks([chunk for chunks in group for chunk in chunks])
+                yield from group
+                group = []
+                group_size = 0
         
-        return code_chunks
+        if group:
+            self._embed_chunks([chunk for chunks in group for chunk in chunks])
+            yield from group
     
     def index_file(self, file_path: str) -> List[CodeChunk]:
         """Index a single code file"""
+        chunks = self._parse_and_chunk_file(file_path)
+        self._embed_chunks(chunks)
+        return chunks
+    
+    def _chunk_files(self, file_paths: List[str]) -> Iterator[Tuple[str, List[CodeChunk], Optional[str]]]:
+        """Read and chunk files in order, yielding each path, its chunks and any error"""
+        if len(file_paths) < self.PARALLEL_CHUNKING_MIN_FILES:
+            for file_path in file_paths:
+                yield _chunk_file_safely(self, file_path)
+            return
+        
+        worker = functools.partial(_chunk_file_worker, self.chunk_size, self.overlap)
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+            yield from pool.map(worker, file_paths, chunksize=self.CHUNKING_CHUNKSIZE)
+    
+    def _parse_and_chunk_file(self, file_path: str) -> List[CodeChunk]:
+        """Read a code file and split it into chunks, without embedding them"""
         if not AnalyzerFactory.is_supported(file_path):
             return []
         
@@ -61,46 +148,32 @@ class CodeIndexer:
         # Also create text-based chunks for broader context
         chunks.extend(self._create_text_chunks(file_path, content))
         
-        # Generate embeddings for all chunks
-        for chunk in chunks:
-            chunk.embedding = self._generate_embedding(chunk.content)
-        
         return chunks
     
-    def _find_code_files(self, project_dir: Path, extensions: List[str], exclude_patterns: List[str]) -> List[Path]:
+    def _embed_chunks(self, chunks: List[CodeChunk]) -> None:
+        """Embed chunks in place with one batched pass"""
+        embeddings = self._generate_embeddings_batch([chunk.content for chunk in chunks])
+        for chunk, embedding in zip(chunks, embeddings):
+            chunk.embedding = embedding
+    
+    def _find_code_files(self, project_dir: Path, extensions: List[str], exclude_patterns: List[str]) -> List[str]:
         """Find all code files in project directory"""
-        code_files = []
-        
-        for root, dirs, files in os.walk(project_dir):
-            # Filter out excluded directories
-            dirs[:] = [d for d in dirs if not self._should_exclude(d, exclude_patterns)]
-            
-            for file in files:
-                file_path = Path(root) / file
-                
-                # Check if file should be excluded
-                if self._should_exclude(str(file_path), exclude_patterns):
-                    continue
-                
-                # Check if file has supported extension
-                if file_path.suffix in extensions:
-                    code_files.append(file_path)
-        
-        return code_files
+        exclude_re = _compile_exclude_patterns(tuple(exclude_patterns))
+        exclude = functools.partial(self._should_exclude, exclude_re=exclude_re)
+        return list(iter_source_files(str(project_dir), frozenset(extensions), exclude, exclude))
     
-    def _should_exclude(self, path: str, exclude_patterns: List[str]) -> bool:
-        """Check if path should be excluded based on patterns"""
-        import fnmatch
-        
-        for pattern in exclude_patterns:
-            if fnmatch.fnmatch(path, pattern) or fnmatch.fnmatch(os.path.basename(path), pattern):
-                return True
+    def _should_exclude(self, path: str, exclude_re: Optional[Pattern]) -> bool:
+        """Check if a path or its base name matches the compiled exclude patterns"""
+        if exclude_re is None:
+            return False
         
-        return False
+        path = os.path.normcase(path)
+        return exclude_re.match(path) is not None or exclude_re.match(os.path.basename(path)) is not None
     
     def _create_semantic_chunks(self, file_path: str, content: str, analyzer) -> List[CodeChunk]:
         """Create semantic chunks based on code structure"""
         chunks = []
+        lines = content.split('\n')
         
         try:
             # Extract functions
@@ -110,7 +183,6 @@ class CodeIndexer:
                 end_line = func.get('end_line', start_line)
                 
                 # Extract function content
-                lines = content.split('\n')
                 func_content = '\n'.join(lines[start_line-1:end_line])
                 
                 if func_content.strip():
@@ -136,7 +208,6 @@ class CodeIndexer:
                     end_line = cls.get('end_line', start_line)
                     
                     # Extract class content
-                    lines = content.split('\n')
                     class_content = '\n'.join(lines[start_line-1:end_line])
                     
                     if class_content.strip():
@@ -176,6 +247,10 @@ class CodeIndexer:
             chunks.append(chunk)
             return chunks
         
+        # Offsets of every newline, so line numbers are found by bisection
+        # instead of recounting the content before each chunk
+        newline_offsets = [match.start() for match in _NEWLINE_RE.finditer(content)]
+        
         # Split into overlapping chunks
         start = 0
         chunk_num = 0
@@ -185,8 +260,8 @@ class CodeIndexer:
             chunk_content = content[start:end]
             
             # Find line boundaries
-            start_line = content[:start].count('\n') + 1
-            end_line = content[:end].count('\n') + 1
+            start_line = bisect.bisect_left(newline_offsets, start) + 1
+            end_line = bisect.bisect_left(newline_offsets, end) + 1
             
             chunk = CodeChunk(
                 content=chunk_content,
@@ -211,25 +286,214 @@ class CodeIndexer:
         
         return chunks
     
-    def _generate_embedding(self, text: str) -> List[float]:
-        """Generate embedding for text"""
-        try:
-            embedding = self.model.encode(text, convert_to_tensor=False)
-            return embedding.tolist()
-        except Exception as e:
-            print(f"Warning: Failed to generate embedding: {e}")
+    def _generate_embeddings_batch(self, texts: List[str]) -> List[Optional[Sequence[float]]]:
+        """Generate embeddings for several texts with one batched encode call
+        
+        SentenceTransformer.encode already orders its input by length before
+        batching and restores the order afterwards, so each batch is padded
+        only to similar lengths without sorting here. Texts already in the
+        embedding cache are not encoded at all.
+        
+        Embeddings are float32 numpy vectors, rows of the encoded matrix, and
+        are only converted to lists at the vector store boundary. Returns None
+        for every uncached text if encoding fails.
+        """
+        if not texts:
             return []
+        
+        # Reuse cached embeddings and only encode texts the cache has not seen;
+        # keys name the model as loaded, so fallbacks and fp16 never mix in
+        keys = [self.embedding_cache.make_key(self.model_id, text) for text in texts]
+        cached = self.embedding_cache.get_many(keys)
+        
+        missing = list(dict.fromkeys(key for key in keys if key not in cached))
+        if missing:
+            text_by_key = dict(zip(keys, texts))
+            try:
+                embeddings = self.model.encode(
+                    [text_by_key[key] for key in missing],
+                    batch_size=self.EMBEDDING_BATCH_SIZE,
+                    convert_to_numpy=True,
+                    show_progress_bar=False
+                )
+            except Exception as e:
+                print(f"Warning: Failed to generate embeddings: {e}")
+                return [cached.get(key) for key in keys]
+            
+            new_embeddings = dict(zip(missing, embeddings))
+            self.embedding_cache.put_many(new_embeddings.items())
+            cached.update(new_embeddings)
+        
+        return [cached[key] for key in keys]
     
     def get_file_hash(self, file_path: str) -> str:
-        """Get hash of file content for change detection"""
+        """Get hash of file content for change detection
+        
+        Uses the non-cryptographic xxh3_64 when xxhash is installed, then
+        BLAKE3 when blake3 is, and MD5 otherwise, reading the file in
+        fixed-size blocks.
+        """
+        digest = _new_file_digest()
         try:
             with open(file_path, 'rb') as f:
-                content = f.read()
-                return hashlib.md5(content).hexdigest()
+                for block in iter(lambda: f.read(self.HASH_BLOCK_SIZE), b''):
+                    digest.update(block)
         except Exception:
             return ""
+        
+        return digest.hexdigest()
     
     def should_reindex_file(self, file_path: str, stored_hash: str) -> bool:
         """Check if file should be reindexed based on content hash"""
         current_hash = self.get_file_hash(file_path)
-        return current_hash != stored_hash
\ No newline at end of file
+        return current_hash != stored_hash
+
+
+_NEWLINE_RE = re.compile('\n')
+
+
+def _chunk_file_safely(indexer: CodeIndexer, file_path: str) -> Tuple[str, List[CodeChunk], Optional[str]]:
+    """Chunk a file, returning the error message instead of raising"""
+    try:
+        return file_path, indexer._parse_and_chunk_file(file_path), None
+    except Exception as e:
+        return file_path, [], str(e)
+
+
+def _chunk_file_worker(chunk_size: int, overlap: int, file_path: str) -> Tuple[str, List[CodeChunk], Optional[str]]:
+    """Chunk a file in a worker process"""
+    return _chunk_file_safely(_chunking_indexer(chunk_size, overlap), file_path)
+
+
+@functools.lru_cache(maxsize=4)
+def _chunking_indexer(chunk_size: int, overlap: int) -> CodeIndexer:
+    """Get the indexer a worker process chunks files with; it never embeds"""
+    indexer = CodeIndexer()
+    indexer.chunk_size = chunk_size
+    indexer.overlap = overlap
+    return indexer
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_exclude_patterns(patterns: Tuple[str, ...]) -> Optional[Pattern]:
+    """Compile glob patterns into one regex with fnmatch.fnmatch semantics
+    
+    Replaces a per-pattern fnmatch call for every directory entry with a
+    single match. Returns None when there are no patterns.
+    """
+    if not patterns:
+        return None
+    
+    return re.compile('|'.join(fnmatch.translate(os.path.normcase(pattern)) for pattern in patterns))
+
+
+def _new_file_digest():
+    """Create a digest object with the fastest available hash"""
+    if xxhash is not None:
+        return xxhash.xxh3_64()
+    if blake3 is not None:
+        return blake3()
+    return hashlib.md5()
+
+
+# Int8 ONNX exports published with all-MiniLM-L6-v2, by CPU architecture
+_ONNX_INT8_FILES = {
+    'arm64': 'onnx/model_qint8_arm64.onnx',
+    'aarch64': 'onnx/model_qint8_arm64.onnx',
+}
+_ONNX_INT8_DEFAULT_FILE = 'onnx/model_quint8_avx2.onnx'
+
+
+@functools.lru_cache(maxsize=4)
+def _load_embedding_model(model_name: str, backend: str = "torch") -> Tuple[Any, str]:
+    """Load an embedding model once per process and prepare it for inference
+    
+    Every CodeIndexer with the same model and backend shares the instance,
+    so repeated indexers and engines don't reload it from disk. The model is
+    put in eval mode; SentenceTransformer.encode already runs without
+    autograd. PyTorch models on a CUDA device run in half precision, and the
+    "torch-compile" backend also compiles the encoder with torch.compile.
+    
+    Returns the model and the identifier of the vectors it produces.
+    """
+    model, loaded_backend = _read_embedding_model(model_name, backend)
+    model.eval()
+    
+    if loaded_backend != "onnx-int8" and model.device.type == "cuda":
+        model.half()
+    
+    if loaded_backend == "torch-compile":
+        _compile_encoder(model)
+    
+    return model, _embedding_model_id(model_name, loaded_backend, model)
+
+
+def _embedding_model_id(model_name: str, backend: str, model) -> str:
+    """Identify a loaded model's vectors by name, backend, dtype and device
+    
+    A compiled encoder computes the same vectors as the eager one, so both
+    count as the torch backend.
+    """
+    if backend == "onnx-int8":
+        return f"{model_name}:onnx-int8"
+    
+    parameter = next(model.parameters(), None)
+    dtype = str(parameter.dtype).replace('torch.', '') if parameter is not None else 'unknown'
+    return f"{model_name}:torch:{dtype}:{model.device.type}"
+
+
+def _compile_encoder(model) -> None:
+    """Compile the transformer inside a SentenceTransformer with torch.compile
+    
+    Shapes are marked dynamic so batches of different lengths reuse one graph.
+    Compilation happens on the first call, so a warm-up encode is run here
+    and the eager module is restored if it fails, e.g. before PyTorch 2.0.
+    """
+    transformer = model[0]
+    eager_model = getattr(transformer, 'auto_model', None)
+    if eager_model is None:
+        print("Warning: Embedding model has no transformer to compile, running it eagerly")
+        return
+    
+    try:
+        import torch
+        transformer.auto_model = torch.compile(eager_model, dynamic=True)
+        model.encode(["def warm_up(): pass"], show_progress_bar=False)
+    except Exception as e:
+        transformer.auto_model = eager_model
+        print(f"Warning: Could not compile embedding model, running it eagerly: {e}")
+
+
+def _read_embedding_model(model_name: str, backend: str = "torch"):
+    """Load a SentenceTransformer, preferring the locally cached copy
+    
+    A plain load revalidates an already downloaded model against the Hugging
+    Face Hub on every start. The Hub is only contacted when the model is not
+    cached yet, or on sentence-transformers releases without local_files_only.
+    
+    The "onnx-int8" backend runs a dynamically quantized ONNX export through
+    ONNX Runtime, which needs sentence-transformers 3.2 or later with the
+    onnx extra. If it cannot be loaded the PyTorch model is used instead.
+    
+    Returns the model and the backend that was actually loaded.
+    """
+    import platform
+    from sentence_transformers import SentenceTransformer
+    
+    kwargs = {}
+    if backend == "onnx-int8":
+        file_name = _ONNX_INT8_FILES.get(platform.machine().lower(), _ONNX_INT8_DEFAULT_FILE)
+        kwargs = {'backend': 'onnx', 'model_kwargs': {'file_name': file_name}}
+    
+    try:
+        return SentenceTransformer(model_name, local_files_only=True, **kwargs), backend
+    except Exception:
+        pass
+    
+    try:
+        return SentenceTransformer(model_name, **kwargs), backend
+    except Exception as e:
+        if not kwargs:
+            raise
+        print(f"Warning: Could not load {backend} embedding backend, using torch: {e}")
+        return SentenceTransformer(model_name), "torch"
@@ -2,7 +2,7 @@
 
 import chromadb
 from chromadb.config import Settings
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable
 import json
 import os
 from pathlib import Path
@@ -46,15 +46,15 @@ class VectorStore:
         metadatas = []
         
         for i, chunk in enumerate(chunks):
-            if not chunk.embedding:
+            if chunk.embedding is None or len(chunk.embedding) == 0:
                 continue
             
             # Create unique ID
             chunk_id = f"{chunk.file_path}:{chunk.start_line}:{chunk.end_line}:{i}"
             ids.append(chunk_id)
             
-            # Add embedding
-            embeddings.append(chunk.embedding)
+            # Add embedding; ChromaDB only accepts plain lists
+            embeddings.append(_as_list(chunk.embedding))
             
             # Add document content
             documents.append(chunk.content)
@@ -215,6 +215,14 @@ class VectorStore:
         if results['ids']:
             self.collection.delete(ids=results['ids'])
     
+    def delete_file_chunks_bulk(self, file_paths: Iterable[str]) -> None:
+        """Delete all chunks for several files in a single operation"""
+        file_paths = list(dict.fromkeys(file_paths))
+        if not file_paths:
+            return
+        
+        self.collection.delete(where={"file_path": {"$in": file_paths}})
+    
     def get_file_chunks(self, file_path: str) -> List[CodeChunk]:
         """Get all chunks for a specific file"""
         results = self.collection.get(
@@ -295,6 +303,9 @@ class VectorStore:
         
         return stats
     
+    def flush(self) -> None:
+        """Persist pending changes; ChromaDB already writes each change itself"""
+    
     def close(self):
         """Close the vector store and clean up resources"""
         try:
@@ -312,4 +323,9 @@ class VectorStore:
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit"""
-        self.close()
\ No newline at end of file
+        self.close()
+
+
+def _as_list(embedding) -> List[float]:
+    """Convert an embedding, such as a numpy vector, to a list of floats"""
+    return embedding.tolist() if hasattr(embedding, 'tolist') else list(embedding)
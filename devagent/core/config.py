@@ -15,6 +15,7 @@ class LLMConfig:
     api_key_env: str = "OPENAI_API_KEY"
     max_tokens: int = 4000
     temperature: float = 0.1
+    cache_responses: bool = True
 
 
 @dataclass
@@ -25,6 +26,8 @@ class IndexingConfig:
     chunk_size: int = 1000
     overlap: int = 100
     supported_extensions: list = None
+    embedding_backend: str = "torch"  # "onnx-int8" for quantized CPU inference, "torch-compile" for torch.compile
+    vector_backend: str = "chroma"  # or "faiss" for large codebases
     
     def __post_init__(self):
         if self.exclude_patterns is None:
@@ -48,6 +51,7 @@ class PerformanceConfig:
     max_memory_mb: int = 2048
     index_batch_size: int = 100
     retrieval_top_k: int = 5
+    max_parallel_llm_calls: int = 8
 
 
 @dataclass
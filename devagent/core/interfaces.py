@@ -1,7 +1,7 @@
 """Core interfaces and abstract base classes"""
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
 from dataclasses import dataclass
 
 
@@ -14,7 +14,7 @@ class CodeChunk:
     end_line: int
     chunk_type: str  # 'function', 'class', 'module'
     metadata: Dict[str, Any]
-    embedding: Optional[List[float]] = None
+    embedding: Optional[Sequence[float]] = None  # float32 numpy vector when indexed locally
 
 
 @dataclass
@@ -40,6 +40,8 @@ class TaskResult:
 class CodeAnalyzer(ABC):
     """Abstract base class for code analyzers"""
     
+    __slots__ = ()
+    
     @abstractmethod
     def analyze_function(self, file_path: str, function_name: str) -> Dict[str, Any]:
         """Analyze a specific function"""
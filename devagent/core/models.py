@@ -1,5 +1,6 @@
 """Extended data models for DevAgent"""
 
+from array import array
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional, Union
 from pathlib import Path
@@ -30,6 +31,48 @@ class FunctionAnalysis:
     end_line: int = 0
 
 
+@dataclass
+class FunctionBatch:
+    """Columnar summary of many functions
+    
+    One list or typed array per field, so large result sets carry one object
+    per column instead of one dict per function, and pickle compactly.
+    """
+    names: List[str] = field(default_factory=list)
+    file_paths: List[str] = field(default_factory=list)
+    start_lines: array = field(default_factory=lambda: array('i'))
+    end_lines: array = field(default_factory=lambda: array('i'))
+    complexities: array = field(default_factory=lambda: array('i'))
+    parameters: List[List[Parameter]] = field(default_factory=list)
+    return_types: List[Optional[str]] = field(default_factory=list)
+    docstrings: List[Optional[str]] = field(default_factory=list)
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def append(self, function: FunctionAnalysis) -> None:
+        """Add one analyzed function"""
+        self.names.append(function.name)
+        self.file_paths.append(function.file_path)
+        self.start_lines.append(function.start_line)
+        self.end_lines.append(function.end_line)
+        self.complexities.append(function.complexity_score)
+        self.parameters.append(function.parameters)
+        self.return_types.append(function.return_type)
+        self.docstrings.append(function.docstring)
+    
+    def extend(self, other: 'FunctionBatch') -> None:
+        """Add every function of another batch"""
+        self.names.extend(other.names)
+        self.file_paths.extend(other.file_paths)
+        self.start_lines.extend(other.start_lines)
+        self.end_lines.extend(other.end_lines)
+        self.complexities.extend(other.complexities)
+        self.parameters.extend(other.parameters)
+        self.return_types.extend(other.return_types)
+        self.docstrings.extend(other.docstrings)
+
+
 @dataclass
 class TestPatterns:
     """Test patterns detected in project"""
@@ -0,0 +1,74 @@
+"""Filesystem path helpers shared across agents"""
+
+import os
+import functools
+from pathlib import Path
+from typing import Callable, FrozenSet, Iterator, Optional
+
+
+PROJECT_ROOT_INDICATORS = frozenset({'setup.py', 'pyproject.toml', 'package.json', '.git'})
+
+
+def _has_project_indicator(dir_path: Path) -> bool:
+    """Check a directory for a project root indicator with a single scandir"""
+    return has_any_entry(dir_path, PROJECT_ROOT_INDICATORS)
+
+
+def has_any_entry(dir_path, names: frozenset) -> bool:
+    """Check whether a directory contains any of the given names
+    
+    One directory listing replaces a stat per candidate name; unreadable
+    directories count as having none.
+    """
+    try:
+        with os.scandir(dir_path) as entries:
+            return not names.isdisjoint(entry.name for entry in entries)
+    except OSError:
+        return False
+
+
+@functools.lru_cache(maxsize=1024)
+def find_project_root(dir_path: str) -> str:
+    """Find the project root for a directory, walking up through its parents
+
+    Results are memoized per directory, so every file in the same directory
+    shares one lookup.
+    """
+    path = Path(dir_path)
+
+    while path != path.parent:
+        if _has_project_indicator(path):
+            return str(path)
+        path = path.parent
+
+    return dir_path
+
+
+def iter_source_files(root: str, extensions: FrozenSet[str],
+                      exclude_dir: Callable[[str], bool],
+                      exclude_file: Optional[Callable[[str], bool]] = None) -> Iterator[str]:
+    """Walk a directory with os.scandir, yielding files with one of the given extensions
+    
+    exclude_dir is called with a directory's name and prunes it when true;
+    exclude_file, if given, is called with a matching file's path. Entries are
+    classified from the directory listing and suffixes are checked on the
+    name string, so no Path is built per entry. Paths match
+    str(Path(root) / name). As with os.walk, symlinked directories are not
+    followed and unreadable directories are skipped.
+    """
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                name = entry.name
+                path = name if root == '.' else os.path.join(root, name)
+                
+                if entry.is_dir():
+                    if not entry.is_symlink() and not exclude_dir(name):
+                        yield from iter_source_files(path, extensions, exclude_dir, exclude_file)
+                    continue
+                
+                dot = name.rfind('.')
+                if dot > 0 and name[dot:] in extensions and not (exclude_file and exclude_file(path)):
+                    yield path
+    except OSError:
+        return
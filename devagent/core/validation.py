@@ -2,6 +2,8 @@
 
 import os
 import re
+import textwrap
+import functools
 from pathlib import Path
 from typing import List, Optional, Union, Tuple
 import ast
@@ -9,6 +11,7 @@ import ast
 
 # Import from error_handling module
 from .error_handling import ValidationError
+from .paths import has_any_entry
 
 
 class InputValidator:
@@ -17,6 +20,10 @@ class InputValidator:
     SUPPORTED_EXTENSIONS = {'.py', '.js', '.ts', '.java', '.go', '.rs', '.cs'}
     SUPPORTED_FORMATS = {'markdown', 'rst', 'docstring'}
     SUPPORTED_REFACTOR_TYPES = {'extract-method', 'rename-variable', 'optimize', 'modernize'}
+    PROJECT_INDICATORS = frozenset({
+        'setup.py', 'pyproject.toml', 'package.json', 'Cargo.toml',
+        'pom.xml', 'build.gradle', '.git', 'src', 'lib'
+    })
     
     @staticmethod
     def validate_file_path(file_path: str) -> Path:
@@ -107,13 +114,7 @@ class InputValidator:
         path = InputValidator.validate_directory_path(project_path)
         
         # Check if it looks like a code project (has common files/directories)
-        common_indicators = [
-            'setup.py', 'pyproject.toml', 'package.json', 'Cargo.toml',
-            'pom.xml', 'build.gradle', '.git', 'src', 'lib'
-        ]
-        
-        has_indicator = any((path / indicator).exists() for indicator in common_indicators)
-        if not has_indicator:
+        if not has_any_entry(path, InputValidator.PROJECT_INDICATORS):
             raise ValidationError(
                 f"Directory does not appear to be a code project: {project_path}"
             )
@@ -168,16 +169,39 @@ class CodeValidator:
     
     @staticmethod
     def validate_code_syntax(code: str, language: str) -> Tuple[bool, List[str]]:
-        """Validate code syntax based on language"""
+        """Validate code syntax based on language
+        
+        Outcomes are memoized, so identical code is only parsed once.
+        """
+        is_valid, errors = _validate_code_syntax_cached(code, language.lower())
+        return is_valid, list(errors)
+    
+    @staticmethod
+    def repair_code_syntax(code: str, language: str) -> Optional[str]:
+        """Try cheap local fixes for common syntax errors in generated code
+        
+        Handles stray markdown fences, over-indented blocks and closing
+        brackets dropped from the end of otherwise complete JavaScript.
+        Returns the repaired code, or None if no fix validates, so that
+        truncated output goes back to the LLM instead.
+        """
         language = language.lower()
+        code = _strip_code_fences(code)
         
         if language == 'python':
-            return CodeValidator.validate_python_syntax(code)
+            candidates = [code, textwrap.dedent(code), textwrap.dedent(code.expandtabs(4))]
         elif language in ['javascript', 'typescript']:
-            return CodeValidator.validate_javascript_syntax(code)
+            candidates = [code]
+            closers = _missing_trailing_closers(code)
+            if closers:
+                candidates.append(code.rstrip() + closers + "\n")
         else:
-            # For unsupported languages, just check basic structure
-            return True, []
+            candidates = [code]
+        
+        for candidate in candidates:
+            if CodeValidator.validate_code_syntax(candidate, language)[0]:
+                return candidate
+        return None
     
     @staticmethod
     def check_code_style(code: str, language: str) -> Tuple[bool, List[str]]:
@@ -200,6 +224,94 @@ class CodeValidator:
         return len(warnings) == 0, warnings
 
 
+@functools.lru_cache(maxsize=256)
+def _validate_code_syntax_cached(code: str, language: str) -> Tuple[bool, Tuple[str, ...]]:
+    """Validate code syntax, memoized on the code and language"""
+    if language == 'python':
+        is_valid, errors = CodeValidator.validate_python_syntax(code)
+    elif language in ['javascript', 'typescript']:
+        is_valid, errors = CodeValidator.validate_javascript_syntax(code)
+    else:
+        # For unsupported languages, just check basic structure
+        is_valid, errors = True, []
+    return is_valid, tuple(errors)
+
+
+def _strip_code_fences(code: str) -> str:
+    """Remove a markdown code fence wrapped around generated code"""
+    lines = code.strip('\n').split('\n')
+    if lines and lines[0].lstrip().startswith('```'):
+        lines = lines[1:]
+        if lines and lines[-1].strip() == '```':
+            lines = lines[:-1]
+        return '\n'.join(lines) + '\n'
+    return code
+
+
+_JS_BRACKET_PAIRS = {'(': ')', '[': ']', '{': '}'}
+_JS_CLOSERS = frozenset(_JS_BRACKET_PAIRS.values())
+# Most closers that may be appended; more suggests the output was cut off
+_MAX_APPENDED_CLOSERS = 2
+
+
+def _missing_trailing_closers(code: str) -> str:
+    """Get the closing brackets dropped from the end of JavaScript code
+    
+    Brackets inside strings, template literals and comments are skipped.
+    Returns an empty string unless the code only lacks a few closers after
+    a finished statement or block: a mismatched closer, an unterminated
+    string or comment, or code ending mid-statement all mean the output was
+    cut off or is otherwise broken, which appended brackets cannot fix.
+    """
+    stack = []
+    last = ''
+    i = 0
+    length = len(code)
+    
+    while i < length:
+        char = code[i]
+        
+        if char == '/' and code.startswith('//', i):
+            end = code.find('\n', i)
+            i = length if end == -1 else end
+            continue
+        
+        if char == '/' and code.startswith('/*', i):
+            end = code.find('*/', i + 2)
+            if end == -1:
+                return ''
+            i = end + 2
+            continue
+        
+        if char in '\'"`':
+            i += 1
+            while i < length and code[i] != char:
+                if code[i] == '\\':
+                    i += 1
+                elif code[i] == '\n' and char != '`':
+                    return ''
+                i += 1
+            if i >= length:
+                return ''
+            last = char
+            i += 1
+            continue
+        
+        if char in _JS_BRACKET_PAIRS:
+            stack.append(_JS_BRACKET_PAIRS[char])
+        elif char in _JS_CLOSERS:
+            if not stack or stack.pop() != char:
+                return ''
+        
+        if not char.isspace():
+            last = char
+        i += 1
+    
+    if not stack or len(stack) > _MAX_APPENDED_CLOSERS or last not in ('}', ';'):
+        return ''
+    return ''.join(reversed(stack))
+
+
 class ConfigValidator:
     """Validates configuration values"""
     
@@ -2,12 +2,14 @@
 
 from .providers import LLMProviderFactory, OpenAIProvider, OllamaProvider, MockLLMProvider
 from .prompts import TestGenerationPrompts, DocumentationPrompts, RefactoringPrompts, GeneralPrompts
+from .dispatcher import LLMDispatcher
 
 __all__ = [
     'LLMProviderFactory',
     'OpenAIProvider', 
     'OllamaProvider',
     'MockLLMProvider',
+    'LLMDispatcher',
     'TestGenerationPrompts',
     'DocumentationPrompts', 
     'RefactoringPrompts',
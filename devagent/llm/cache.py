@@ -0,0 +1,173 @@
+"""Response caching for LLM providers"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+import functools
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Iterator
+
+
+class LLMResponseCache:
+    """In-memory LRU cache of LLM responses backed by an on-disk store"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_memory_entries: int = 1024,
+                 ttl_seconds: int = 7 * 24 * 3600):
+        if cache_dir is None:
+            cache_dir = os.path.expanduser("~/.devagent/llm_cache")
+
+        self.cache_dir = Path(cache_dir)
+        self.max_memory_entries = max_memory_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Build a cache key from the parts that determine a response"""
+        data = "\0".join(str(part) for part in parts).encode('utf-8')
+        return hashlib.blake2b(data, digest_size=32).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response, or None if missing or expired"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+
+        if entry is None:
+            entry = self._read_entry(key)
+            if entry is None:
+                return None
+            self._remember(key, entry)
+
+        if time.time() - entry['created'] > self.ttl_seconds:
+            self.invalidate(key)
+            return None
+
+        return entry['response']
+
+    def set(self, key: str, response: str) -> None:
+        """Store a response in memory and on disk"""
+        entry = {'created': time.time(), 'response': response}
+        self._remember(key, entry)
+
+        entry_path = self._entry_path(key)
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            # Per-writer name, so pool threads and other processes never share it
+            tmp_path = entry_path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            print(f"Warning: Could not write LLM cache entry: {e}")
+
+    def invalidate(self, key: str) -> None:
+        """Remove a single entry"""
+        with self._lock:
+            self._memory.pop(key, None)
+        try:
+            self._entry_path(key).unlink()
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        """Remove all cached responses"""
+        with self._lock:
+            self._memory.clear()
+        for entry_path in self.cache_dir.glob('*/*.json'):
+            try:
+                entry_path.unlink()
+            except OSError:
+                pass
+
+    def _remember(self, key: str, entry: dict) -> None:
+        """Insert an entry into the in-memory LRU"""
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def _read_entry(self, key: str) -> Optional[dict]:
+        """Read an entry from disk"""
+        try:
+            with open(self._entry_path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _entry_path(self, key: str) -> Path:
+        """Get the on-disk location of an entry"""
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> LLMResponseCache:
+    """Get the process-wide response cache"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LLMResponseCache()
+        return _default_cache
+
+
+def cached_generate(provider, cache: LLMResponseCache, provider_name: str, api_key_env: str = ""):
+    """Wrap a provider's generate_code so identical requests are served from cache
+
+    The key covers everything that changes the response: provider, model,
+    temperature, token limit, API key variable, prompt and context.
+    """
+    generate_code = provider.generate_code
+
+    @functools.wraps(generate_code)
+    def wrapper(prompt: str, context: str = "", max_tokens: int = None) -> str:
+        key = _response_key(cache, provider, provider_name, api_key_env, prompt, context, max_tokens)
+        response = cache.get(key)
+        if response is None:
+            response = generate_code(prompt, context, max_tokens)
+            cache.set(key, response)
+        return response
+
+    return wrapper
+
+
+def cached_stream_generate(provider, cache: LLMResponseCache, provider_name: str, api_key_env: str = ""):
+    """Wrap a provider's stream_generate so it shares entries with cached_generate
+
+    A cache hit is yielded in one piece; a miss is streamed through and
+    stored once the stream completes.
+    """
+    stream_generate = provider.stream_generate
+
+    @functools.wraps(stream_generate)
+    def wrapper(prompt: str, context: str = "", max_tokens: int = None) -> Iterator[str]:
+        key = _response_key(cache, provider, provider_name, api_key_env, prompt, context, max_tokens)
+        response = cache.get(key)
+        if response is not None:
+            yield response
+            return
+
+        parts = []
+        for part in stream_generate(prompt, context, max_tokens):
+            parts.append(part)
+            yield part
+        cache.set(key, ''.join(parts))
+
+    return wrapper
+
+
+def _response_key(cache: LLMResponseCache, provider, provider_name: str, api_key_env: str,
+                  prompt: str, context: str, max_tokens: Optional[int]) -> str:
+    """Build the cache key for a generation request"""
+    return cache.make_key(
+        provider_name, provider.model, provider.temperature,
+        max_tokens or provider.max_tokens, api_key_env, prompt, context
+    )
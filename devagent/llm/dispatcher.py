@@ -0,0 +1,48 @@
+"""Shared dispatching of LLM requests across agents"""
+
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Iterator
+
+from devagent.core.interfaces import LLMProvider
+
+
+class LLMDispatcher(LLMProvider):
+    """Runs LLM requests from every agent through one shared provider
+
+    Requests are queued on a worker pool shared by every agent, so concurrent
+    bulk jobs (for example per-function documentation) are bounded by a
+    single limit instead of one limit per agent.
+    """
+
+    def __init__(self, provider: LLMProvider, max_parallel_requests: int = 8):
+        self.provider = provider
+        self.max_parallel_requests = max_parallel_requests
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_parallel_requests,
+            thread_name_prefix="devagent-llm"
+        )
+
+    def submit(self, prompt: str, context: str = "", max_tokens: int = None) -> Future:
+        """Submit a generation request and return a future for its result"""
+        return self._executor.submit(self.provider.generate_code, prompt, context, max_tokens)
+
+    def generate_code(self, prompt: str, context: str = "", max_tokens: int = None) -> str:
+        """Generate code through the shared pool"""
+        return self.submit(prompt, context, max_tokens).result()
+
+    async def agenerate_code(self, prompt: str, context: str = "", max_tokens: int = None) -> str:
+        """Generate code through the shared pool without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(prompt, context, max_tokens))
+
+    def stream_generate(self, prompt: str, context: str = "", max_tokens: int = None) -> Iterator[str]:
+        """Stream a response directly from the underlying provider"""
+        return self.provider.stream_generate(prompt, context, max_tokens)
+
+    def analyze_code(self, code: str, task: str) -> Dict[str, Any]:
+        """Analyze code using the underlying provider"""
+        return self.provider.analyze_code(code, task)
+
+    def close(self) -> None:
+        """Shut down the worker pool"""
+        self._executor.shutdown(wait=False)
@@ -1,6 +1,7 @@
 """Prompt templates for different tasks"""
 
-from typing import Dict, Any, List, Optional
+from string import Formatter
+from typing import Dict, Any, List, Optional, Callable, Tuple
 from devagent.core.interfaces import CodeChunk
 from devagent.core.models import FunctionAnalysis, TestPatterns
 
@@ -188,29 +189,55 @@ Generate complete module documentation:
         include_examples: bool = True
     ) -> str:
         """Create prompt for function documentation"""
+        return DocumentationPrompts.build_function_doc_prompt_factory(
+            language, format, context, include_examples
+        )(function_analysis, function_code)
+    
+    @staticmethod
+    def build_function_doc_prompt_factory(
+        language: str,
+        format: str,
+        context: List[CodeChunk],
+        include_examples: bool = True
+    ) -> Callable[[FunctionAnalysis, str], str]:
+        """Create a function documentation prompt builder for one file
         
-        # Format parameters
-        params_str = "\n".join([
-            f"- {p.name} ({p.type_hint or 'Any'}): {p.default_value if p.default_value else 'Required'}"
-            for p in function_analysis.parameters
-        ]) if function_analysis.parameters else "None"
-        
+        The parts shared by every function of the file (language, format and
+        context) are rendered once; the returned builder only fills in the
+        per-function fields.
+        """
         # Format context
         context_str = "\n\n".join([
             f"From {chunk.file_path}:\n```{language}\n{chunk.content}\n```"
             for chunk in context[:3]  # Limit to 3 context chunks
         ]) if context else "No additional context"
         
-        return DocumentationPrompts.FUNCTION_DOC_TEMPLATE.format(
-            language=language,
-            function_code=function_code,
-            function_name=function_analysis.name,
-            parameters=params_str,
-            return_type=function_analysis.return_type or "Unknown",
-            complexity=function_analysis.complexity_score,
-            context=context_str,
-            format=format
+        literals, fields = _compile_template(
+            DocumentationPrompts.FUNCTION_DOC_TEMPLATE,
+            {'language': language, 'context': context_str, 'format': format}
         )
+        
+        def build(function_analysis: FunctionAnalysis, function_code: str) -> str:
+            # Format parameters
+            params_str = "\n".join([
+                f"- {p.name} ({p.type_hint or 'Any'}): {p.default_value if p.default_value else 'Required'}"
+                for p in function_analysis.parameters
+            ]) if function_analysis.parameters else "None"
+            
+            values = {
+                'function_code': function_code,
+                'function_name': function_analysis.name,
+                'parameters': params_str,
+                'return_type': function_analysis.return_type or "Unknown",
+                'complexity': function_analysis.complexity_score,
+            }
+            parts = [literals[0]]
+            for field, literal in zip(fields, literals[1:]):
+                parts.append(str(values[field]))
+                parts.append(literal)
+            return ''.join(parts)
+        
+        return build
 
 
 class RefactoringPrompts:
@@ -414,4 +441,24 @@ Provide detailed feedback with specific suggestions for improvement:
             language=language,
             code=code,
             context=context_str
-        )
\ No newline at end of file
+        )
+
+
+def _compile_template(template: str, constants: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    """Pre-render the constant fields of a template
+    
+    Returns the literal segments, with constants folded in, and the names of
+    the remaining fields that fall between them.
+    """
+    literals = [""]
+    fields = []
+    for literal, field, _, _ in Formatter().parse(template):
+        literals[-1] += literal
+        if field is None:
+            continue
+        if field in constants:
+            literals[-1] += str(constants[field])
+        else:
+            fields.append(field)
+            literals.append("")
+    return literals, fields
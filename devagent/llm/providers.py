@@ -2,13 +2,20 @@
 
 import os
 import time
-from typing import Dict, Any, Optional, List
+import asyncio
+import logging
+import functools
+from typing import Dict, Any, Optional, List, Iterator
 from abc import ABC, abstractmethod
 
 import openai
 from openai import OpenAI
 
 from devagent.core.interfaces import LLMProvider
+from devagent.llm.cache import LLMResponseCache, cached_generate, cached_stream_generate, get_default_cache
+
+
+logger = logging.getLogger(__name__)
 
 
 class BaseLLMProvider(LLMProvider):
@@ -33,11 +40,21 @@ class BaseLLMProvider(LLMProvider):
                 wait_time = self.retry_delay * (2 ** attempt)
                 print(f"Attempt {attempt + 1} failed: {e}. Retrying in {wait_time}s...")
                 time.sleep(wait_time)
+    
+    async def agenerate_code(self, prompt: str, context: str = "", max_tokens: int = None) -> str:
+        """Generate code without blocking the event loop"""
+        return await asyncio.to_thread(self.generate_code, prompt, context, max_tokens)
+    
+    def stream_generate(self, prompt: str, context: str = "", max_tokens: int = None) -> Iterator[str]:
+        """Generate code, yielding the response in pieces as it arrives"""
+        yield self.generate_code(prompt, context, max_tokens)
 
 
 class OpenAIProvider(BaseLLMProvider):
     """OpenAI API provider"""
     
+    CODE_SYSTEM_PROMPT = "You are an expert software developer. Generate clean, well-documented code that follows best practices."
+    
     def __init__(self, model: str = "gpt-4o-mini", api_key_env: str = "OPENAI_API_KEY", 
                  max_tokens: int = 4000, temperature: float = 0.1):
         super().__init__(model, max_tokens, temperature)
@@ -60,7 +77,7 @@ class OpenAIProvider(BaseLLMProvider):
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "You are an expert software developer. Generate clean, well-documented code that follows best practices."},
+                    {"role": "system", "content": self.CODE_SYSTEM_PROMPT},
                     {"role": "user", "content": full_prompt}
                 ],
                 max_tokens=max_tokens,
@@ -70,6 +87,30 @@ class OpenAIProvider(BaseLLMProvider):
         
         return self._retry_with_backoff(_make_request)
     
+    def stream_generate(self, prompt: str, context: str = "", max_tokens: int = None) -> Iterator[str]:
+        """Generate code using OpenAI API, yielding tokens as they arrive"""
+        if max_tokens is None:
+            max_tokens = self.max_tokens
+        
+        full_prompt = self._construct_prompt(prompt, context)
+        
+        # Only opening the stream is retried; retrying mid-stream would repeat output
+        stream = self._retry_with_backoff(
+            self.client.chat.completions.create,
+            model=self.model,
+            messages=[
+                {"role": "system", "content": self.CODE_SYSTEM_PROMPT},
+                {"role": "user", "content": full_prompt}
+            ],
+            max_tokens=max_tokens,
+            temperature=self.temperature,
+            stream=True
+        )
+        
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
     def analyze_code(self, code: str, task: str) -> Dict[str, Any]:
         """Analyze code for specific task requirements"""
         prompt = f"""
@@ -161,6 +202,29 @@ class OllamaProvider(BaseLLMProvider):
         
         return self._retry_with_backoff(_make_request)
     
+    def stream_generate(self, prompt: str, context: str = "", max_tokens: int = None) -> Iterator[str]:
+        """Generate code using Ollama, yielding tokens as they arrive"""
+        if max_tokens is None:
+            max_tokens = self.max_tokens
+        
+        full_prompt = self._construct_prompt(prompt, context)
+        
+        # Only opening the stream is retried; retrying mid-stream would repeat output
+        stream = self._retry_with_backoff(
+            self.ollama.generate,
+            model=self.model,
+            prompt=full_prompt,
+            options={
+                'num_predict': max_tokens,
+                'temperature': self.temperature
+            },
+            stream=True
+        )
+        
+        for chunk in stream:
+            if chunk['response']:
+                yield chunk['response']
+    
     def analyze_code(self, code: str, task: str) -> Dict[str, Any]:
         """Analyze code for specific task requirements"""
         prompt = f"""
@@ -309,15 +373,64 @@ class LLMProviderFactory:
     }
     
     @classmethod
-    def create_provider(cls, provider_name: str, **kwargs) -> LLMProvider:
-        """Create LLM provider instance"""
+    def create_provider(cls, provider_name: str, use_cache: bool = True,
+                        cache: Optional[LLMResponseCache] = None, **kwargs) -> LLMProvider:
+        """Create LLM provider instance
+        
+        Responses from real providers are memoized in the shared response
+        cache unless ``use_cache`` is False.
+        """
         provider_class = cls.PROVIDERS.get(provider_name.lower())
         if not provider_class:
             raise ValueError(f"Unknown provider: {provider_name}. Available: {list(cls.PROVIDERS.keys())}")
         
-        return provider_class(**kwargs)
+        provider = provider_class(**kwargs)
+        
+        if use_cache and provider_class is not MockLLMProvider:
+            cache = cache or get_default_cache()
+            api_key_env = kwargs.get('api_key_env', '')
+            provider.generate_code = cached_generate(provider, cache, provider_name.lower(), api_key_env)
+            provider.stream_generate = cached_stream_generate(provider, cache, provider_name.lower(), api_key_env)
+        
+        return provider
+    
+    @classmethod
+    def create_provider_with_fallback(cls, llm_config) -> LLMProvider:
+        """Create the provider described by an LLM config, falling back to mock
+        
+        The result is memoized per configuration, so every agent built from
+        the same config shares one provider instead of probing it again.
+        """
+        return _create_provider_with_fallback(
+            llm_config.provider,
+            llm_config.model,
+            llm_config.api_key_env,
+            llm_config.max_tokens,
+            llm_config.temperature,
+            llm_config.cache_responses
+        )
     
     @classmethod
     def get_available_providers(cls) -> List[str]:
         """Get list of available providers"""
-        return list(cls.PROVIDERS.keys())
\ No newline at end of file
+        return list(cls.PROVIDERS.keys())
+
+
+@functools.lru_cache(maxsize=4)
+def _create_provider_with_fallback(provider_name: str, model: str, api_key_env: str,
+                                   max_tokens: int, temperature: float, use_cache: bool) -> LLMProvider:
+    """Create a provider, using the mock provider if it cannot be created"""
+    try:
+        provider = LLMProviderFactory.create_provider(
+            provider_name,
+            model=model,
+            api_key_env=api_key_env,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            use_cache=use_cache
+        )
+        logger.info(f"Using {provider_name} provider with model {model}")
+        return provider
+    except Exception as e:
+        logger.warning(f"Could not create {provider_name} provider, falling back to mock provider: {e}")
+        return LLMProviderFactory.create_provider('mock')